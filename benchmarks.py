@@ -0,0 +1,164 @@
+# Course: CS261 - Data Structures
+# Author: Theresa Quach
+# Assignment: Graph Implementation Benchmarks
+# Description: Timing scripts comparing the storage modes of the undirected and directed graph implementations.
+#              Sizes are set by the constants below and can be edited for quicker runs.
+
+import random
+import sys
+import time
+import tracemalloc
+
+from d_graph import DirectedGraph
+from ud_graph import UndirectedGraph
+
+POWER_LAW_EDGES = 1_000_000                                                                                             # number of edges in the generated power-law graph
+POWER_LAW_DEGREE = 5                                                                                                    # edges added per new vertex (preferential attachment)
+MEMORY_EDGES = 10_000_000                                                                                               # number of edges in the graph used for the memory comparison
+ROUTING_VERTICES = 20_000                                                                                               # size of the random sparse directed graph for dijkstra_many
+ROUTING_OUT_DEGREE = 8
+ROUTING_SOURCES = 256
+BFS_VERTICES = 1_000_000                                                                                                # size of the random sparse directed graph for the frontier BFS
+BFS_OUT_DEGREE = 5
+
+
+def power_law_edges(edge_count, m=POWER_LAW_DEGREE, seed=261):
+    """
+    Function that returns a list of about edge_count undirected edges (as tuples of vertex name strings) following a power-law
+    degree distribution, built by preferential attachment: every new vertex connects to m existing vertices picked with
+    probability proportional to their degree, so a few hub vertices end up with a very large number of neighbors.
+    """
+    rnd = random.Random(seed)
+    edges = []
+    endpoints = list(range(m))                                                                                          # every vertex appears once per incident edge -> sampling from it is degree-proportional
+    vertex = m
+    while len(edges) < edge_count:
+        targets = set()
+        while len(targets) < m:
+            targets.add(rnd.choice(endpoints))
+        for target in targets:
+            edges.append((f'v{vertex}', f'v{target}'))
+            endpoints.append(target)
+            endpoints.append(vertex)
+        vertex += 1
+    return edges[:edge_count]
+
+
+def time_it(func, *args):
+    """
+    Function that calls func with the given arguments and returns a tuple of (result, seconds taken)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_undirected_storage(edges):
+    """
+    Function that ingests the same edge list into an UndirectedGraph for each storage mode and prints the time taken to
+    build the graph, validate every edge as a path, and remove every edge again.
+    """
+    for storage in ('hash', 'list'):
+        g, build = time_it(UndirectedGraph, edges, storage)
+        paths = [[u, v] for u, v in edges]
+        _, check = time_it(lambda: all(g.is_valid_path(path) for path in paths))
+        _, remove = time_it(lambda: [g.remove_edge(u, v) for u, v in edges])
+        print(f'{storage:>6}: build {build:8.2f}s  is_valid_path {check:8.2f}s  remove_edge {remove:8.2f}s')
+
+
+def adjacency_bytes(g):
+    """
+    Function that returns the number of bytes taken by the adjacency structures of an UndirectedGraph: every container and
+    every object they own (for compact storage also the int objects held as values of ids, the CSR arrays and the pending
+    rows), but not the vertex name strings, which are shared by every storage mode
+    """
+    if g.storage == 'compact':
+        store = g.adj_list
+        total = sum(sys.getsizeof(part) for part in (store.ids, store.names, store.offsets, store.targets, store.pending, store.free_ids))
+        total += sum(sys.getsizeof(i) for i in store.ids.values())
+        return total + sum(sys.getsizeof(row) for row in store.pending.values())
+    return sys.getsizeof(g.adj_list) + sum(sys.getsizeof(neighbors) for neighbors in g.adj_list.values())
+
+
+def bench_undirected_memory(edges):
+    """
+    Function that builds the same graph with each storage mode and prints the adjacency bytes per edge, counted by
+    adjacency_bytes and cross-checked with tracemalloc (memory still allocated once the graph is built)
+    """
+    for storage in ('list', 'hash', 'compact'):
+        tracemalloc.start()
+        g = UndirectedGraph(edges, storage)
+        traced = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f'{storage:>8}: {adjacency_bytes(g) / g.edge_count:6.1f} bytes per edge  (traced {traced / g.edge_count:6.1f})')
+        del g
+
+
+def random_directed_graph(v_count, out_degree, seed=261):
+    """
+    Function that returns a sparse DirectedGraph with v_count vertices, each with out_degree edges to random vertices
+    (weights 1 to 100)
+    """
+    rnd = random.Random(seed)
+    edges = ((src, rnd.randrange(v_count), rnd.randint(1, 100)) for src in range(v_count) for _ in range(out_degree))
+    return DirectedGraph.from_edges((edge for edge in edges if edge[0] != edge[1]), v_count=v_count, storage='sparse')
+
+
+def bench_dijkstra_many(g, sources):
+    """
+    Function that times dijkstra_many over the same sources with 1, 2, 4 and 8 worker processes and prints the speedup
+    relative to a single worker
+    """
+    base = None
+    for workers in (1, 2, 4, 8):
+        _, seconds = time_it(lambda: sum(1 for _ in g.dijkstra_many(sources, workers)))
+        base = base or seconds
+        print(f'{workers} worker(s): {seconds:8.2f}s  speedup {base / seconds:5.2f}x')
+
+
+def bench_connected_components(g):
+    """
+    Function that times connected_components with 1, 2, 4 and 8 worker processes and prints the speedup relative to a
+    single worker
+    """
+    base = None
+    for workers in (1, 2, 4, 8):
+        (count, _), seconds = time_it(g.connected_components, workers)
+        base = base or seconds
+        print(f'{workers} worker(s): {seconds:8.2f}s  speedup {base / seconds:5.2f}x  ({count} components)')
+
+
+def bench_bfs(g, src=0):
+    """
+    Function that times the vertex-by-vertex bfs against the level-synchronous bfs_levels (ascending and ordered levels)
+    from the same source, and checks that the ordered levels visit the vertices in the same order
+    """
+    visited, queue_time = time_it(g.bfs, src)
+    _, level_time = time_it(g.bfs_levels, src)
+    levels, ordered_time = time_it(g.bfs_levels, src, True)
+    assert [v for level in levels for v in level] == visited
+    print(f'bfs {queue_time:8.2f}s  bfs_levels {level_time:8.2f}s  ordered {ordered_time:8.2f}s  ({len(levels)} levels)')
+
+
+if __name__ == '__main__':
+
+    print(f"\nUndirectedGraph storage - {POWER_LAW_EDGES} edge power-law graph")
+    print("-----------------------------------------------------------")
+    bench_undirected_storage(power_law_edges(POWER_LAW_EDGES))
+
+    print(f"\nUndirectedGraph memory - {MEMORY_EDGES} edge power-law graph")
+    print("-----------------------------------------------------------")
+    bench_undirected_memory(power_law_edges(MEMORY_EDGES))
+
+    print(f"\nDirectedGraph.dijkstra_many - {ROUTING_SOURCES} sources, {ROUTING_VERTICES} vertices")
+    print("-----------------------------------------------------------")
+    routing = random_directed_graph(ROUTING_VERTICES, ROUTING_OUT_DEGREE)
+    bench_dijkstra_many(routing, range(ROUTING_SOURCES))
+
+    print(f"\nDirectedGraph.bfs_levels - {BFS_VERTICES} vertices, out-degree {BFS_OUT_DEGREE}")
+    print("-----------------------------------------------------------")
+    bench_bfs(random_directed_graph(BFS_VERTICES, BFS_OUT_DEGREE))
+
+    print(f"\nUndirectedGraph.connected_components - {POWER_LAW_EDGES} edge power-law graph")
+    print("-----------------------------------------------------------")
+    bench_connected_components(UndirectedGraph.from_edges(power_law_edges(POWER_LAW_EDGES), storage='compact'))
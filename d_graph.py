@@ -3,8 +3,22 @@
 # Assignment:   #6 Directed Graph Implementation
 # Description: Implementation of an directed graph using an adjacency matrix to store the vertices and edges of the graph
 
-from collections import deque
+from array import array
+from bisect import bisect_left
+from collections import deque, OrderedDict
+from itertools import chain
+from multiprocessing import Pool
 import heapq
+import os
+
+from graph_io import attach_shared_arrays, read_edges, read_snapshot, shared_arrays, worker_arrays, write_snapshot
+
+try:                                                                                                                        # NumPy is optional: only used by the vectorised methods, which fall back to plain Python without it
+    import numpy as np
+except ImportError:
+    np = None
+
+DIRECTED_SNAPSHOT = 2                                                                                                       # graph kind stored in snapshot files written by DirectedGraph.save
 
 class DirectedGraph:
     """
@@ -15,12 +29,38 @@ class DirectedGraph:
     - vertex names are integers
     """
 
-    def __init__(self, start_edges=None):
+    def __init__(self, start_edges=None, storage='matrix', track_order=False):
         """
-        Store graph info as adjacency matrix
+        Store graph info as adjacency matrix. The storage argument picks the layout of each vertex's row: 'matrix' (default)
+        keeps a full V x V list of lists, 'sparse' keeps one dict of {dst: weight} per vertex so memory and traversal cost
+        follow the number of edges instead of V squared, 'numpy' keeps the matrix as a 2-D NumPy integer array (8 bytes per
+        entry, bulk queries are vectorised; needs NumPy installed).
+        If track_order is True, a topological order is kept up to date on every edit (see TopologicalOrder).
+        Graphs opened with load(path, mmap=True) use the read-only 'mapped' mode, reading the edges in CSR layout straight
+        from the memory-mapped file (adj_matrix is None)
         """
+        if storage not in ('matrix', 'sparse', 'numpy'):
+            raise ValueError(f'unknown storage mode: {storage}')
+        if storage == 'numpy' and np is None:
+            raise ImportError('numpy storage requires NumPy')
+        self.storage = storage
         self.v_count = 0
         self.adj_matrix = []
+        self._buffer = None                                                                                                 # numpy storage only: capacity x capacity array, adj_matrix is its top-left V x V view
+        if storage == 'numpy':
+            self._buffer = np.zeros((0, 0), dtype=np.int64)
+            self.adj_matrix = self._buffer
+        self.version = 0                                                                                                    # bumped by every change to the vertices or edges
+        self.dijkstra_cache = None                                                                                          # DijkstraCache while dijkstra memoisation is enabled
+        self._successor_cache = dict()                                                                                      # vertex -> ascending (dst, weight) list, rebuilt lazily after the vertex's row changes
+        self._predecessor_cache = dict()                                                                                    # vertex -> ascending (src, weight) list of incoming edges, rebuilt lazily
+        self._in_edges = []                                                                                                 # sparse storage only: one {src: weight} dict of incoming edges per vertex
+        self._observers = []                                                                                                # maintained indexes notified of every vertex addition and edge change
+        self._order = None                                                                                                  # TopologicalOrder while order tracking is enabled
+        self._reach = None                                                                                                  # ReachabilityIndex while the reachability index is enabled
+        self._csr = None                                                                                                    # mapped storage only: (offsets, targets, weights) memoryviews
+        self._csr_index = None                                                                                              # (version, offsets, targets) NumPy copies of the CSR layout used by the frontier BFS
+        self._edge_lookup = None                                                                                            # (version, bool matrix or sorted src * V + dst keys) used by validate_paths
 
         # populate graph with initial vertices and edges (if provided)
         # before using, implement add_vertex() and add_edge() methods
@@ -28,10 +68,11 @@ class DirectedGraph:
             v_count = 0
             for u, v, _ in start_edges:
                 v_count = max(v_count, u, v)
-            for _ in range(v_count + 1):
-                self.add_vertex()
+            self._presize(v_count + 1)                                                                                      # allocate all rows at once instead of growing every row per vertex
             for u, v, weight in start_edges:
                 self.add_edge(u, v, weight)
+        if track_order:                                                                                                     # build the order once, after the initial edges
+            self.enable_order_tracking()
 
     def __str__(self):
         """
@@ -43,24 +84,126 @@ class DirectedGraph:
         out += ' '.join(['{:2}'.format(i) for i in range(self.v_count)]) + '\n'
         out += '-' * (self.v_count * 3 + 3) + '\n'
         for i in range(self.v_count):
-            row = self.adj_matrix[i]
+            row = self._row(i)
             out += '{:2} |'.format(i)
             out += ' '.join(['{:2}'.format(w) for w in row]) + '\n'
         out = f"GRAPH ({self.v_count} vertices):\n{out}"
         return out
 
+    @classmethod
+    def from_edges(cls, edges, trusted=True, v_count=None, storage='matrix', track_order=False):
+        """
+        Method that builds a graph from an iterable of (src, dst, weight) edges. If v_count (number of vertices) is given,
+        the edges are consumed only once, so they can come from a generator; otherwise they are collected first to find the
+        largest vertex index. Storage for all vertices is allocated once up front.
+        If trusted is True the input is declared clean (indexes in range, no loops, positive weights, no duplicate edges) and
+        the weights are written directly, without the checks done by add_edge. Otherwise each edge goes through add_edge.
+        Order tracking, if asked for, is turned on once after all edges are in
+        """
+        if v_count is None:
+            edges = list(edges)
+            v_count = max((max(src, dst) for src, dst, _ in edges), default=-1) + 1
+        g = cls(storage=storage)
+        g._presize(v_count)
+        if not trusted:
+            for src, dst, weight in edges:
+                g.add_edge(src, dst, weight)
+        elif storage == 'sparse':
+            out_edges, in_edges = g.adj_matrix, g._in_edges
+            for src, dst, weight in edges:
+                out_edges[src][dst] = weight
+                in_edges[dst][src] = weight
+        elif storage == 'numpy':                                                                                            # one fancy-indexed assignment for all edges
+            edges = list(edges)
+            if edges:
+                srcs, dsts, weights = zip(*edges)
+                weights = np.array(weights)
+                if weights.dtype.kind == 'f':
+                    g._buffer = g.adj_matrix = g._buffer.astype(float)
+                g.adj_matrix[list(srcs), list(dsts)] = weights
+        else:
+            rows = g.adj_matrix
+            for src, dst, weight in edges:
+                rows[src][dst] = weight
+        g.version += 1
+        if track_order:
+            g.enable_order_tracking()
+        return g
+
+    @classmethod
+    def from_edge_file(cls, path, delimiter=None, trusted=True, v_count=None, storage='matrix', track_order=False):
+        """
+        Method that builds a graph from a text file with one edge per line: source index, destination index and an optional
+        weight (1 if missing). The file is streamed in chunks (see graph_io.read_edge_chunks for the accepted formats). If
+        v_count is not given, the file is read twice: once to find the largest vertex index, once to load the edges
+        """
+        if v_count is None:
+            v_count = 0
+            for fields in read_edges(path, delimiter):
+                v_count = max(v_count, int(fields[0]) + 1, int(fields[1]) + 1)
+        edges = ((int(fields[0]), int(fields[1]), _parse_weight(fields)) for fields in read_edges(path, delimiter))
+        return cls.from_edges(edges, trusted, v_count, storage, track_order)
+
     # ------------------------------------------------------------------ #
 
+    @classmethod
+    def load(cls, path, mmap=True, storage='matrix'):
+        """
+        Method that opens a snapshot file written by save. With mmap=True the file is memory-mapped and the graph reads its
+        edges directly from the mapping (read-only 'mapped' storage), so traversals and dijkstra can run right away without
+        rebuilding any Python objects. With mmap=False the edges are copied into a normal, editable graph with the given
+        storage mode
+        """
+        kind, sections, buffer = read_snapshot(path, mmap)
+        if kind != DIRECTED_SNAPSHOT:
+            raise ValueError(f'{path} is not a directed graph snapshot')
+        offsets, targets, weights = sections['offsets'], sections['targets'], sections['weights']
+        if not mmap:
+            edges = ((src, targets[i], weights[i]) for src in range(len(offsets) - 1) for i in range(offsets[src], offsets[src + 1]))
+            return cls.from_edges(edges, True, len(offsets) - 1, storage)
+        g = cls()
+        g.storage = 'mapped'
+        g.v_count = len(offsets) - 1
+        g.adj_matrix = None
+        g._csr = (offsets, targets, weights)
+        g._snapshot = buffer                                                                                                # keeps the mapping open as long as the graph exists
+        return g
+
+
+    def save(self, path) -> None:
+        """
+        Method that writes the graph to a binary snapshot file (see graph_io for the layout) holding the edges in CSR layout:
+        the destinations of all edges grouped by source (targets), their weights, and where each source's edges start (offsets)
+        """
+        offsets, targets, weights = self._csr_arrays()
+        write_snapshot(path, DIRECTED_SNAPSHOT, [('offsets', offsets), ('targets', targets), ('weights', weights)])
+
+
     def add_vertex(self) -> int:
         """
         Method that adds a new vertex to the graph, starting from integer index 0 and increasing upward. The method
         returns an integer representing the number of vertices in the graph after the addition.
         """
+        self._check_writable()
         self.v_count += 1                                                                                                   # increment number of vertices in matrix
-        new_vertex = [0 for x in range(self.v_count)]                                                                       # create new list(row) for new vertex with edges to other vertices in matrix initialized to 0
-        self.adj_matrix.append(new_vertex)                                                                                  # add new row to matrix
-        for row in range(self.v_count-1):                                                                                   # go to previous rows
-            self.adj_matrix[row].append(0)                                                                                  # add another column in each row for new vertex, initialized to 0
+        if self.storage == 'sparse':                                                                                        # sparse rows only hold existing edges -> new vertex is an empty dict, other rows untouched
+            self.adj_matrix.append({})
+            self._in_edges.append({})
+        elif self.storage == 'numpy':
+            if self.v_count > len(self._buffer):                                                                            # buffer full -> double its capacity, so the matrix is copied only O(log V) times
+                capacity = max(4, 2 * len(self._buffer))
+                buffer = np.zeros((capacity, capacity), dtype=self._buffer.dtype)
+                buffer[:self.v_count-1, :self.v_count-1] = self.adj_matrix
+                self._buffer = buffer
+            self.adj_matrix = self._buffer[:self.v_count, :self.v_count]                                                    # view, the new row and column are already 0
+        else:
+            new_vertex = [0 for x in range(self.v_count)]                                                                   # create new list(row) for new vertex with edges to other vertices in matrix initialized to 0
+            self.adj_matrix.append(new_vertex)                                                                              # add new row to matrix
+            for row in range(self.v_count-1):                                                                               # go to previous rows
+                self.adj_matrix[row].append(0)                                                                              # add another column in each row for new vertex, initialized to 0
+        self.version += 1
+        for observer in self._observers:
+            observer.vertex_added(self.v_count - 1)
         return self.v_count
 
 
@@ -81,7 +224,10 @@ class DirectedGraph:
             return
         if weight < 0:
             return
-        self.adj_matrix[src][dst] = weight
+        if self._order is not None and self._order.reject_cycles and weight != 0 and self._weight(src, dst) == 0:
+            if self._order.creates_cycle(src, dst):                                                                         # edge would close a cycle -> rejected
+                return
+        self._set_weight(src, dst, weight)
 
 
     def remove_edge(self, src: int, dst: int) -> None:
@@ -93,7 +239,135 @@ class DirectedGraph:
             return
         if dst > self.v_count-1 or dst < 0:
             return
-        self.adj_matrix[src][dst] = 0                                                                                       # reset edge to 0 to remove (if no edge exists, still 0)
+        self._set_weight(src, dst, 0)                                                                                       # reset edge to 0 to remove (if no edge exists, still 0)
+
+
+    def _presize(self, v_count: int) -> None:
+        """
+        Helper method that allocates storage for v_count vertices without edges in one step. Only used on an empty graph
+        (no maintained indexes are notified)
+        """
+        self.v_count = v_count
+        if self.storage == 'sparse':
+            self.adj_matrix = [{} for x in range(v_count)]
+            self._in_edges = [{} for x in range(v_count)]
+        elif self.storage == 'numpy':
+            self._buffer = self.adj_matrix = np.zeros((v_count, v_count), dtype=self._buffer.dtype)
+        else:
+            self.adj_matrix = [[0] * v_count for x in range(v_count)]
+
+
+    def _weight(self, src: int, dst: int) -> int:
+        """
+        Helper method that returns the weight of the edge from src to dst, or 0 if there is no edge
+        """
+        if self.storage == 'sparse':
+            return self.adj_matrix[src].get(dst, 0)
+        if self.storage == 'mapped':                                                                                        # binary search in src's ascending targets
+            offsets, targets, weights = self._csr
+            i = bisect_left(targets, dst, offsets[src], offsets[src + 1])
+            return weights[i] if i < offsets[src + 1] and targets[i] == dst else 0
+        if self.storage == 'numpy':                                                                                         # plain Python number instead of a NumPy scalar
+            return self.adj_matrix[src, dst].item()
+        return self.adj_matrix[src][dst]
+
+
+    def _check_writable(self) -> None:
+        """
+        Helper method that raises TypeError if the graph can't be changed (opened from a memory-mapped snapshot)
+        """
+        if self.storage == 'mapped':
+            raise TypeError('graph loaded from a memory-mapped snapshot is read-only')
+
+
+    def _set_weight(self, src: int, dst: int, weight: int) -> None:
+        """
+        Helper method that stores the weight of the edge from src to dst. A weight of 0 means no edge, so for sparse storage
+        the entry is deleted instead of stored. Maintained indexes are notified with the old and new weight
+        """
+        self._check_writable()
+        old_weight = self._weight(src, dst)
+        self._successor_cache.pop(src, None)                                                                                # src's successor list and dst's predecessor list are now out of date
+        self._predecessor_cache.pop(dst, None)
+        if self.storage == 'sparse':
+            if weight == 0:
+                self.adj_matrix[src].pop(dst, None)
+                self._in_edges[dst].pop(src, None)
+            else:
+                self.adj_matrix[src][dst] = weight
+                self._in_edges[dst][src] = weight
+        elif self.storage == 'numpy':
+            if isinstance(weight, float) and self._buffer.dtype.kind != 'f':                                                # first non-integer weight -> switch the matrix to floats
+                self._buffer = self._buffer.astype(float)
+                self.adj_matrix = self._buffer[:self.v_count, :self.v_count]
+            self.adj_matrix[src, dst] = weight
+        else:
+            self.adj_matrix[src][dst] = weight
+        if old_weight != weight:
+            self.version += 1
+        for observer in self._observers:
+            observer.edge_changed(src, dst, old_weight, weight)
+
+
+    def _successors(self, src: int):
+        """
+        Helper method that returns the direct successors of src as (dst, weight) tuples in ascending dst order. The list is
+        cached per vertex and only rebuilt (row scan for matrix storage, sort of the existing edges for sparse storage) after
+        an edge leaving src was added, updated or removed. The returned list must not be modified by the caller.
+        Mapped storage builds the list from the mapped slices on every call instead of caching it
+        """
+        if self.storage == 'mapped':
+            offsets, targets, weights = self._csr
+            return list(zip(targets[offsets[src]:offsets[src + 1]], weights[offsets[src]:offsets[src + 1]]))
+        successors = self._successor_cache.get(src)
+        if successors is None:
+            if self.storage == 'sparse':
+                successors = sorted(self.adj_matrix[src].items())
+            elif self.storage == 'numpy':
+                row = self.adj_matrix[src]
+                dsts = np.flatnonzero(row)
+                successors = list(zip(dsts.tolist(), row[dsts].tolist()))
+            else:
+                successors = [(dst, weight) for dst, weight in enumerate(self.adj_matrix[src]) if weight != 0]
+            self._successor_cache[src] = successors
+        return successors
+
+
+    def _predecessors(self, dst: int):
+        """
+        Helper method that returns the direct predecessors of dst (vertices with an edge into dst) as (src, weight) tuples in
+        ascending src order. Cached like _successors; matrix storage scans the column, sparse storage keeps a reverse index
+        """
+        predecessors = self._predecessor_cache.get(dst)
+        if predecessors is None:
+            if self.storage == 'sparse':
+                predecessors = sorted(self._in_edges[dst].items())
+            elif self.storage == 'mapped':
+                predecessors = [(src, self._weight(src, dst)) for src in range(self.v_count) if self._weight(src, dst) != 0]
+            elif self.storage == 'numpy':
+                column = self.adj_matrix[:, dst]
+                srcs = np.flatnonzero(column)
+                predecessors = list(zip(srcs.tolist(), column[srcs].tolist()))
+            else:
+                predecessors = [(src, row[dst]) for src, row in enumerate(self.adj_matrix) if row[dst] != 0]
+            self._predecessor_cache[dst] = predecessors
+        return predecessors
+
+
+    def _row(self, src: int) -> []:
+        """
+        Helper method that returns the full matrix row of src as a list of V weights (0 = no edge), whatever the storage mode
+        """
+        if self.storage == 'sparse':
+            return [self.adj_matrix[src].get(dst, 0) for dst in range(self.v_count)]
+        if self.storage == 'mapped':
+            row = [0 for x in range(self.v_count)]
+            for dst, weight in self._successors(src):
+                row[dst] = weight
+            return row
+        if self.storage == 'numpy':
+            return self.adj_matrix[src].tolist()
+        return self.adj_matrix[src]
 
 
     def get_vertices(self) -> []:
@@ -112,13 +386,74 @@ class DirectedGraph:
         vertices, and then the weight of the edge between them. 0 means no edge exists between the two vertices. Order of
         the edges in the list does not matter.
         """
+        if self.storage == 'numpy':                                                                                         # all nonzero entries in one pass, row by row
+            srcs, dsts = np.nonzero(self.adj_matrix)
+            return list(zip(srcs.tolist(), dsts.tolist(), self.adj_matrix[srcs, dsts].tolist()))
         edges = []
         for src in range(self.v_count):
-            for dst in range(self.v_count):
-                if self.adj_matrix[src][dst] != 0:
-                    edges.append((src, dst, self.adj_matrix[src][dst]))
+            for dst, weight in self._successors(src):
+                edges.append((src, dst, weight))
         return edges
 
+
+    def out_degree(self, v=None):
+        """
+        Method that returns the number of edges leaving vertex v (0 if v is not in the graph). Without v, a list with the
+        out-degree of every vertex is returned. Numpy storage counts the nonzero entries of the rows in one vectorised step
+        """
+        if v is None:
+            if self.storage == 'numpy':
+                return np.count_nonzero(self.adj_matrix, axis=1).tolist()
+            return [len(self._successors(src)) for src in range(self.v_count)]
+        if v < 0 or v > self.v_count-1:
+            return 0
+        if self.storage == 'numpy':
+            return int(np.count_nonzero(self.adj_matrix[v]))
+        return len(self._successors(v))
+
+
+    def in_degree(self, v=None):
+        """
+        Method that returns the number of edges entering vertex v (0 if v is not in the graph). Without v, a list with the
+        in-degree of every vertex is returned. Numpy storage counts the nonzero entries of the columns in one vectorised step
+        """
+        if v is None:
+            if self.storage == 'numpy':
+                return np.count_nonzero(self.adj_matrix, axis=0).tolist()
+            degrees = [0 for x in range(self.v_count)]
+            for src in range(self.v_count):
+                for dst, _ in self._successors(src):
+                    degrees[dst] += 1
+            return degrees
+        if v < 0 or v > self.v_count-1:
+            return 0
+        if self.storage == 'numpy':
+            return int(np.count_nonzero(self.adj_matrix[:, v]))
+        return len(self._predecessors(v))
+
+
+    def successors(self, v: int) -> []:
+        """
+        Method that returns the list of vertices with an edge from v, in ascending order (empty if v is not in the graph)
+        """
+        if v < 0 or v > self.v_count-1:
+            return []
+        if self.storage == 'numpy':
+            return np.flatnonzero(self.adj_matrix[v]).tolist()
+        return [dst for dst, _ in self._successors(v)]
+
+
+    def predecessors(self, v: int) -> []:
+        """
+        Method that returns the list of vertices with an edge into v, in ascending order (empty if v is not in the graph)
+        """
+        if v < 0 or v > self.v_count-1:
+            return []
+        if self.storage == 'numpy':
+            return np.flatnonzero(self.adj_matrix[:, v]).tolist()
+        return [src for src, _ in self._predecessors(v)]
+
+
     def is_valid_path(self, path: []) -> bool:
         """
         Method that takes as a parameter a path (which is a list of vertex indices) and returns True if the vertices sequence
@@ -128,177 +463,464 @@ class DirectedGraph:
         if not path:                                                                                                        # if path is empty
             return True
         for i in range(len(path)-1):                                                                                        # iterate through path with i as source and i+1 as destination (because using i+1, need to set range as length of path -1)
-            if self.adj_matrix[path[i]][path[i+1]] == 0:                                                                               # if there is a 0 (nonexisting) edge between source and destination vertices, return False
+            if self._weight(path[i], path[i+1]) == 0:                                                                       # if there is a 0 (nonexisting) edge between source and destination vertices, return False
                 return False
         return True                                                                                                         # if loop exists without returning False, is valid path
 
 
+    def validate_paths(self, paths):
+        """
+        Method that checks many paths at once and returns one boolean per path, the same answer as is_valid_path (a step to or
+        from a vertex index not in the graph makes the path invalid). paths can be a list of lists of vertex indices (any
+        lengths), a 1-D object array of ragged rows or a 2-D integer array with one path per row.
+        With NumPy all paths are joined into one flat array and every pair of consecutive vertices is checked in one
+        vectorised step (see _has_edges), so the cost per path is a few array entries instead of a Python call.
+        Returns a NumPy bool array, or a list of bools without NumPy
+        """
+        if np is None:                                                                                                      # same checks vertex pair by vertex pair (out-of-range vertices -> False)
+            return [all(0 <= path[i] < self.v_count and 0 <= path[i+1] < self.v_count and self._weight(path[i], path[i+1]) != 0
+                        for i in range(len(path)-1)) for path in paths]
+        if isinstance(paths, np.ndarray) and paths.ndim == 2:
+            flat = paths.astype(np.int64).ravel()
+            lengths = np.full(len(paths), paths.shape[1], dtype=np.int64)
+        else:
+            paths = list(paths)
+            lengths = np.fromiter(map(len, paths), dtype=np.int64, count=len(paths))
+            flat = np.fromiter(chain.from_iterable(paths), dtype=np.int64, count=int(lengths.sum()))
+        owner = np.repeat(np.arange(len(lengths)), lengths)                                                                 # index of the path each flat entry belongs to
+        step = owner[:-1] == owner[1:]                                                                                      # flat[i] -> flat[i+1] is a step inside one path
+        missing = step & ~self._has_edges(flat[:-1], flat[1:])
+        valid = np.ones(len(lengths), dtype=bool)
+        valid[owner[:-1][missing]] = False
+        return valid
+
+
+    def _has_edges(self, srcs, dsts):
+        """
+        Helper method that takes two NumPy integer arrays and returns a bool array telling for each i whether the edge
+        srcs[i] -> dsts[i] exists (False if either vertex is not in the graph). Matrix storage is looked up with fancy
+        indexing: numpy storage on adj_matrix itself, list storage on a bool copy of it. Sparse and mapped storage binary
+        search the sorted edge keys src * V + dst instead of allocating V x V entries. Copies and keys are cached until the
+        graph changes
+        """
+        inside = (srcs >= 0) & (srcs < self.v_count) & (dsts >= 0) & (dsts < self.v_count)
+        found = np.zeros(len(srcs), dtype=bool)
+        srcs, dsts = srcs[inside], dsts[inside]
+        if self.storage == 'numpy':
+            found[inside] = self.adj_matrix[srcs, dsts] != 0
+            return found
+        if self._edge_lookup is None or self._edge_lookup[0] != self.version:
+            if self.storage == 'matrix':
+                lookup = np.array(self.adj_matrix, dtype=bool).reshape(self.v_count, self.v_count)
+            else:
+                offsets, targets, _ = self._csr_arrays()
+                counts = np.diff(np.frombuffer(offsets, dtype=np.int64))
+                lookup = np.repeat(np.arange(self.v_count, dtype=np.int64), counts) * self.v_count + np.frombuffer(targets, dtype=np.int64)
+            self._edge_lookup = (self.version, lookup)                                                                      # CSR rows are in ascending order -> keys are already sorted
+        lookup = self._edge_lookup[1]
+        if self.storage == 'matrix':
+            found[inside] = lookup[srcs, dsts]
+        elif len(lookup):
+            queries = srcs * self.v_count + dsts
+            index = np.minimum(np.searchsorted(lookup, queries), len(lookup) - 1)
+            found[inside] = lookup[index] == queries
+        return found
+
+
     def dfs(self, v_start, v_end=None) -> []:
         """
-        Method that takes a starting vertex index and an ending vertex index and an ending vertex and returns a list of
-        vertices visited during a recursive depth-first search of the graph. If the search encounters the ending vertex, or if all of
-        the vertices have been visited, the search will stop. Search proceeds by picking the next ascending value vertex.
+        Method that takes a starting vertex index and an ending vertex index and returns a list of vertices visited during a
+        depth-first search of the graph (collected from the iter_dfs generator). If the search encounters the ending vertex,
+        or if all of the vertices have been visited, the search will stop. Search proceeds by picking the next ascending value vertex.
         """
-        visited = []
-        if v_start < 0 or v_start > self.v_count-1:
-            return visited
-        self.rec_dfs(v_start, v_end, visited)
-        return visited
+        return list(self.iter_dfs(v_start, v_end))
 
 
-    def rec_dfs(self, cur_v=None, end_v=None, list_v=None):
+    def iter_dfs(self, v_start, v_end=None):
         """
-        Recursive helper method for depth-first search of the adjacency matrix graph. Takes as parameters a current vertex,
-        the end vertex originally passed, and a list of already-visited vertices.
-        :param cur_v: current vertex being visited
-        :param end_v: ending vertex
-        :param list_v: list of currently visited vertices
-        :return: list of total visited vertices from DFS
+        Generator method that performs an iterative depth-first search and yields each vertex as it is visited, so callers can
+        stop early without building the full list. Uses an explicit stack of successor iterators instead of recursion and a
+        visited set for O(1) membership checks. Successors are visited in ascending order. Nothing is yielded if the starting
+        vertex is not in the graph, and the search stops right after the ending vertex is yielded.
         """
+        if v_start < 0 or v_start > self.v_count-1:
+            return
+        visited = {v_start}
+        yield v_start
+        if v_start == v_end:
+            return
+        stack = [iter(self._successors(v_start))]                                                                           # stack holds, for each vertex on the current path, an iterator over its remaining successors
+        while stack:
+            for neighbor, _ in stack[-1]:                                                                                   # continue with the next successor of the deepest vertex
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield neighbor
+                    if neighbor == v_end:
+                        return
+                    stack.append(iter(self._successors(neighbor)))                                                          # go one level deeper before looking at the remaining successors
+                    break
+            else:                                                                                                           # all successors of the deepest vertex are visited -> backtrack
+                stack.pop()
 
-        # Append the new vertex to list of vertices visited
-        if cur_v not in list_v:
-            list_v.append(cur_v)
 
-        # Return conditions without visiting additional vertices
-        if cur_v == end_v:
-            return list_v
+    def bfs(self, v_start, v_end=None) -> []:
+        """
+        Method that takes a starting vertex and ending vertex, and returns a list of vertices visited in the graph after
+        a breadth-first search traversal of the graph (collected from the iter_bfs generator).
+        """
+        return list(self.iter_bfs(v_start, v_end))
 
-        # Add neighbors of current vertex to a new deque to visit (in ascending order)
-        v_deque = deque([])
-        for neighbor in range(self.v_count):                                                                                # for a vertex's neighbors
-            if self.adj_matrix[cur_v][neighbor] != 0 and neighbor not in list_v:                                                   # neighbor!=0 -> to be an actual neighbor, and not already visited
-                if not v_deque:                                                                                             # if deque is empty, append first neighbor found
+
+    def iter_bfs(self, v_start, v_end=None):
+        """
+        Generator method that performs an iterative breadth-first search using a deque as queue and a visited set, and yields
+        each vertex when it is first discovered. The direct successors of each vertex are discovered in ascending order.
+        Nothing is yielded if the starting vertex is not in the graph, and the search stops right after the ending vertex is yielded.
+        """
+        if v_start < 0 or v_start > self.v_count-1:
+            return
+        visited = {v_start}
+        yield v_start
+        if v_start == v_end:
+            return
+        v_deque = deque([v_start])                                                                                          # queue of discovered vertices whose successors still have to be examined
+        while v_deque:
+            current = v_deque.popleft()
+            for neighbor, _ in self._successors(current):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield neighbor
+                    if neighbor == v_end:
+                        return
                     v_deque.append(neighbor)
-                else:                                                                                                       # if a neighbor already in the deque
-                    i = 0
-                    deque_len = len(v_deque)
-                    while i < deque_len:                                                                                    # Alphabetizing-while loop
-                        if neighbor < v_deque[i] and neighbor not in v_deque:                                               # go through deque to alphabetize neighbors (i.e. if current neighbor is less than/earlier than neighbor in deque, insert it before the deque-neighbor
-                            v_deque.insert(i, neighbor)
-                        i += 1
-                    if neighbor not in v_deque:                                                                             # if it reaches here, it's later/larger than all other neighbors in deque, so append it to the end
-                        v_deque.append(neighbor)
-
-        # Recursion to set next visited vertex as first neighbor in deque
-        while v_deque:                                                                                                      # while current deque of neighbors is not empty,
-            if end_v in list_v:
-                return list_v
-            current = v_deque.popleft()                                                                                     # pop out first(leftmost) neighbor to be visited next
-            self.rec_dfs(current, end_v, list_v )
-
-        return list_v
 
 
-    def bfs(self, v_start, v_end=None) -> []:
+    def bfs_levels(self, v_start, ordered=False) -> []:
         """
-        Method that takes a starting vertex and ending vertex, and returns a list of vertices visited in the graph after
-        a breadth-first search traversal of the graph. Uses a recursive helper method to perform the breadth-first search
-        of the graph.
-        """
-        visited = []
-        if v_start <0 or v_start>self.v_count-1:
-            return visited
-        v_deque = deque([v_start])                                                                                          # deque to hold current level vertices, initialized with start vertex
-        visited.append(v_start)                                                                                             # add start vertex to visited list
-        self.rec_bfs(v_end, visited, v_deque)
-        return visited
+        Method that runs a level-synchronous breadth-first search from v_start and returns the list of its levels: level k
+        lists the vertices k edges away from v_start, in ascending order, or with ordered=True in the order bfs discovers
+        them (the levels then add up to bfs(v_start)). Returns an empty list if v_start is not in the graph.
+        The search expands a whole level at a time (see _frontiers)
+        """
+        if v_start < 0 or v_start > self.v_count-1:
+            return []
+        return [level.tolist() if np is not None else level for level in self._frontiers(v_start, ordered)]
 
 
-    def rec_bfs(self, end_vertex=None, list_v=None, cur_deque=None):
-        """
-        Recursive helper method for Breadth-First Search that examines current-level vertices from the current deque passed
-        to it and adds direct successor vertices from each vertex examined in a BFS manner
-        :param end_vertex: The vertex that signals the end of the BFS search. If none is provided, or if it doesn't exist
-                in the graph, the BFS continues until all vertices have been visited
-        :param list_v: the list of visited vertices
-        :param cur_deque: the deque of vertices to be processed for their direct successors
-        :return: list of visited vertices
-        """
-        # Check if end vertex is already in list
-        if end_vertex in list_v:
-            return list_v
-
-        # While the v_deque is not empty, pop from the front of the deque -> add successors to s_deque numerically ascending -> add successors in s_deque to visited list -> normal append vertices in s_deque to next_deque
-        s_deque = deque([])                                                                                                 # deque to add successors of current vertex (and added to visited list)
-        next_deque = deque([])                                                                                              # deque with successors that is passed back to method
-        while cur_deque:                                                                                                    # goes through all current level vertices
-            current = cur_deque.popleft()
-
-            # Add current level vertex's direct successors to s_deque if they've not been visited
-            for neighbor in range(self.v_count):
-                if self.adj_matrix[current][neighbor] != 0 and neighbor not in list_v and neighbor not in cur_deque:        # if next index shares an edge with current vertex(actually a neighbor), and not already visited or on current level to be visited
-                    if not s_deque:
-                        s_deque.append(neighbor)
-                    else:
-                        i=0
-                        deque_len = len(s_deque)
-                        while i < deque_len:                                                                                # ordering loop that adds successor vertices into s_deque in ascending order
-                            if neighbor < s_deque[i] and neighbor not in s_deque:
-                                s_deque.insert(i, neighbor)
-                            i +=1
-                        if neighbor not in s_deque:                                                                         # if it reaches here, vertex is later/larger than all other neighbors in deque, so append it to the end
-                            s_deque.append(neighbor)
-
-            # For each element in s_deque (current level vertex's direct successors), if not visited yet, add to visited list
-            for vertex in s_deque:
-                if vertex not in list_v:
-                    list_v.append(vertex)
-                if vertex == end_vertex:  # if end vertex found, return visited list
-                    return list_v
-
-            # Append normally current vertex's direct successors to next_deque(eventually passed back recursively
-            for vertex in s_deque:
-                next_deque.append(vertex)
-
-        # if deque for successors has vertices, pass it back to method recursively
-        if next_deque:
-            self.rec_bfs(end_vertex, list_v, next_deque)
-        return list_v                                                                                                       # if reached here, while loop for current deque has finished and successor deque is empty.
+    def hop_distances(self, v_start) -> []:
+        """
+        Method that returns a list with the number of edges on the shortest path (ignoring weights) from v_start to each
+        vertex, inf for vertices that can't be reached (all inf if v_start is not in the graph)
+        """
+        distances = [float('inf') for x in range(self.v_count)]
+        if v_start < 0 or v_start > self.v_count-1:
+            return distances
+        for hops, level in enumerate(self._frontiers(v_start, False)):
+            for vertex in (level.tolist() if np is not None else level):
+                distances[vertex] = hops
+        return distances
 
 
-    def has_cycle(self)-> bool:
+    def _frontiers(self, v_start: int, ordered: bool):
+        """
+        Generator helper method for bfs_levels and hop_distances that yields the BFS levels from v_start one at a time.
+        With NumPy the visited set is a bool array and the graph is read in CSR layout (see _csr_numpy): the successors of
+        the whole frontier are gathered with one fancy-indexing step, already visited ones are masked out, and duplicates
+        are removed with np.unique (keeping the first discovery for ordered levels), so each level costs a few array
+        operations instead of a Python loop per edge. Levels are then NumPy arrays. Without NumPy the levels are lists,
+        expanded vertex by vertex with a bytearray as visited set
+        """
+        if np is None:
+            visited = bytearray(self.v_count)
+            visited[v_start] = 1
+            frontier = [v_start]
+            while frontier:
+                yield frontier
+                reached = []
+                for current in frontier:
+                    for neighbor, _ in self._successors(current):
+                        if not visited[neighbor]:
+                            visited[neighbor] = 1
+                            reached.append(neighbor)
+                if not ordered:
+                    reached.sort()
+                frontier = reached
+            return
+        offsets, targets = self._csr_numpy()
+        visited = np.zeros(self.v_count, dtype=bool)
+        visited[v_start] = True
+        frontier = np.array([v_start], dtype=np.int64)
+        while len(frontier):
+            yield frontier
+            starts = offsets[frontier]
+            counts = offsets[frontier + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                return
+            index = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)                             # positions in targets of all successors of the frontier, frontier order kept
+            reached = targets[index]
+            reached = reached[~visited[reached]]
+            if ordered:                                                                                                     # keep each vertex where it was first found, like bfs
+                reached, first = np.unique(reached, return_index=True)
+                reached = reached[np.argsort(first)]
+            else:
+                reached = np.unique(reached)
+            visited[reached] = True
+            frontier = reached
+
+
+    def _csr_numpy(self):
+        """
+        Helper method that returns the CSR offsets and targets (see _csr_arrays) as NumPy int64 arrays, cached until the
+        graph changes. Mapped storage wraps the mapped arrays without copying them, the other modes are converted with
+        whole-array operations (see _csr_vectorised)
+        """
+        if self._csr_index is None or self._csr_index[0] != self.version:
+            if self.storage == 'mapped':
+                offsets, targets = np.frombuffer(self._csr[0], dtype=np.int64), np.frombuffer(self._csr[1], dtype=np.int64)
+            else:
+                offsets, targets, _ = self._csr_vectorised(False)
+            self._csr_index = (self.version, offsets, targets)
+        return self._csr_index[1], self._csr_index[2]
+
+
+    def _csr_vectorised(self, with_weights: bool):
         """
-        Method that returns True if the graph contains at least one cycle, and False otherwise. It uses a recursive helper method
-        to do a regular DFS traversal on the graph to check for cycles. Code for detecting cycle in directed graph is modified version
-        of undirected graph (with modifications to include adjacency matrix and removal or parent vertex tracker
+        Helper method that builds the CSR layout (see _csr_arrays) as NumPy arrays without a Python loop per edge and returns
+        (offsets, targets, weights), weights being None unless with_weights is True. Matrix and numpy storage take the
+        nonzero entries of the matrix, which come out grouped by source in ascending target order. Sparse storage
+        concatenates the row dicts in one pass and sorts the edges by the single key source * V + target
         """
-        for vertex in range(len(self.adj_matrix)):                                                                          # checks all vertices
+        if self.storage != 'sparse':
+            matrix = self.adj_matrix
+            if self.storage == 'matrix':
+                matrix = np.array(self.adj_matrix) if self.v_count else np.zeros((0, 0), dtype=np.int64)
+            srcs, targets = np.nonzero(matrix)
+            counts = np.bincount(srcs, minlength=self.v_count)
+            weights = matrix[srcs, targets] if with_weights else None
+        else:
+            counts = np.fromiter(map(len, self.adj_matrix), dtype=np.int64, count=self.v_count)
+            total = int(counts.sum())
+            targets = np.fromiter(chain.from_iterable(self.adj_matrix), dtype=np.int64, count=total)                        # dict keys, in insertion order within each row
+            srcs = np.repeat(np.arange(self.v_count, dtype=np.int64), counts)
+            order = np.argsort(srcs * self.v_count + targets)
+            targets = targets[order]
+            weights = None
+            if with_weights:
+                weights = np.array(list(chain.from_iterable(row.values() for row in self.adj_matrix)))[order] if total else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(self.v_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets, targets.astype(np.int64, copy=False), weights
 
-            # Initialize visited dictionary -> each key is vertex, initialized to False (unvisited)
-            visited = {vertex: False for vertex in range(len(self.adj_matrix))}                                             # Must be initialized within for loop for each component looked at. Otherwise would retain 'True' value from previous components
-            if self.dfs_cycle(vertex, visited) == True:                                                                     # if the dfs traversal returns True, cycle is found, so return True
-                return True
+
+    def has_cycle(self)-> bool:
+        """
+        Method that returns True if the graph contains at least one cycle, and False otherwise.
+        If order tracking is enabled, the flag kept by the TopologicalOrder is returned in O(1). Otherwise an iterative
+        depth-first search with white/grey/black colouring is run in O(V + E): grey vertices are on the current DFS path,
+        black ones are finished, so reaching a grey vertex again means there is a directed cycle
+        """
+        if self._order is not None:
+            return self._order.has_cycle()
+        colour = [0 for x in range(self.v_count)]                                                                           # 0 = white (unvisited), 1 = grey (on current path), 2 = black (finished)
+        for vertex in range(self.v_count):                                                                                  # checks all vertices (colours are shared, each vertex is finished only once)
+            if colour[vertex] != 0:
+                continue
+            colour[vertex] = 1
+            stack = [(vertex, iter(self._successors(vertex)))]                                                              # current DFS path, each vertex with an iterator over its remaining successors
+            while stack:
+                cur_v, successors = stack[-1]
+                for neighbor, _ in successors:
+                    if colour[neighbor] == 1:                                                                               # edge back to a vertex on the current path -> cycle found
+                        return True
+                    if colour[neighbor] == 0:
+                        colour[neighbor] = 1
+                        stack.append((neighbor, iter(self._successors(neighbor))))
+                        break
+                else:                                                                                                       # all successors finished -> current vertex is finished too
+                    colour[cur_v] = 2
+                    stack.pop()
         return False                                                                                                        # all vertices have been checked without returning True, so no cycle exists (False)
 
 
-    def dfs_cycle(self, cur_v=None, list_v = None):
+    def topological_order(self):
+        """
+        Method that returns a list of all vertices in topological order (every edge goes from an earlier vertex to a later one),
+        or None if the graph has a cycle. Uses the maintained order if order tracking is enabled, otherwise Kahn's algorithm
+        """
+        if self._order is not None:
+            return None if self._order.has_cycle() else list(self._order.order)
+        return self._kahn_order()
+
+
+    def _kahn_order(self):
+        """
+        Helper method that runs Kahn's algorithm in O(V + E): vertices with no incoming edges are output first, and removing
+        their outgoing edges frees the next ones. Returns the order as a list, or None if some vertices are never freed (cycle)
+        """
+        in_degree = [0 for x in range(self.v_count)]
+        for src in range(self.v_count):
+            for dst, _ in self._successors(src):
+                in_degree[dst] += 1
+        v_deque = deque([vertex for vertex in range(self.v_count) if in_degree[vertex] == 0])
+        order = []
+        while v_deque:
+            current = v_deque.popleft()
+            order.append(current)
+            for dst, _ in self._successors(current):
+                in_degree[dst] -= 1
+                if in_degree[dst] == 0:
+                    v_deque.append(dst)
+        if len(order) < self.v_count:
+            return None
+        return order
+
+
+    def _scc_labels(self):
+        """
+        Helper method that finds the strongly connected components with an iterative version of Tarjan's algorithm in
+        O(V + E) and returns (labels, count), where labels[v] is the component id of vertex v. Ids are given in the order
+        Tarjan finishes the components, which is a reverse topological order: every edge between two different components
+        goes from a higher id to a lower one
+        """
+        index = [-1 for x in range(self.v_count)]                                                                           # DFS discovery number of each vertex (-1 = not discovered)
+        low = [0 for x in range(self.v_count)]                                                                              # smallest discovery number reachable through the vertex's DFS subtree
+        on_stack = bytearray(self.v_count)
+        stack = []                                                                                                          # discovered vertices whose component isn't finished yet
+        labels = [-1 for x in range(self.v_count)]
+        count = 0
+        counter = 0
+        for root in range(self.v_count):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            path = [(root, iter(self._successors(root)))]                                                                   # DFS path, each vertex with an iterator over its remaining successors
+            while path:
+                v, successors = path[-1]
+                for n, _ in successors:
+                    if index[n] == -1:                                                                                      # tree edge -> go one level deeper
+                        index[n] = low[n] = counter
+                        counter += 1
+                        stack.append(n)
+                        on_stack[n] = 1
+                        path.append((n, iter(self._successors(n))))
+                        break
+                    if on_stack[n] and index[n] < low[v]:                                                                   # edge back into the unfinished part
+                        low[v] = index[n]
+                else:                                                                                                       # all successors done -> v is finished
+                    path.pop()
+                    if path and low[v] < low[path[-1][0]]:
+                        low[path[-1][0]] = low[v]
+                    if low[v] == index[v]:                                                                                  # v is the root of a component -> pop it off the stack
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            labels[w] = count
+                            if w == v:
+                                break
+                        count += 1
+        return labels, count
+
+
+    def strongly_connected_components(self) -> []:
+        """
+        Method that returns the strongly connected components of the graph (groups of vertices that can all reach each
+        other) as a list of vertex lists, each in ascending order, in O(V + E) using an iterative Tarjan search (see
+        _scc_labels). The components are listed in topological order: edges between two components always go from an
+        earlier one to a later one
+        """
+        labels, count = self._scc_labels()
+        components = [[] for x in range(count)]
+        for vertex, c in enumerate(labels):
+            components[count - 1 - c].append(vertex)                                                                        # Tarjan ids are in reverse topological order
+        return components
+
+
+    def condensation(self, storage=None):
+        """
+        Method that returns the condensation of the graph as a new DirectedGraph: vertex i stands for component i of
+        strongly_connected_components(), and there is an edge from component a to component b if some edge of the graph
+        goes from a vertex of a to a vertex of b, weighted with the smallest such edge weight. The result has no cycles.
+        storage picks the storage mode of the new graph (default: the same as this graph, 'sparse' for mapped graphs)
+        """
+        labels, count = self._scc_labels()
+        weights = dict()                                                                                                    # (component, component) -> smallest weight between them
+        for src in range(self.v_count):
+            c_src = count - 1 - labels[src]
+            for dst, weight in self._successors(src):
+                c_dst = count - 1 - labels[dst]
+                if c_src != c_dst and weight < weights.get((c_src, c_dst), float('inf')):
+                    weights[(c_src, c_dst)] = weight
+        if storage is None:
+            storage = 'sparse' if self.storage == 'mapped' else self.storage
+        return DirectedGraph.from_edges(((a, b, w) for (a, b), w in weights.items()), True, count, storage)
+
+
+    def enable_reachability_index(self) -> None:
         """
-        Recursive helper method that does a regular dfs search on the list. No need to keep track of parent vertex as if there is a
-        directed edge from child back to parent, that is considered a loop.
-        :param cur_v: current vertex being visited (starts at vertex passed by calling method)
-        :param list_v: dictionary of vertices whose values equal True if they've been visited and False if unvisited; a vertex
-                resets to false during call if path has to be rewound (to try a different directed path)
-        :return: True if a cycle is found (if a neighboring vertex is already visited but the neighbor of the current vertex isn't its parent
+        Method that builds a reachability index (see ReachabilityIndex) and keeps it up to date on every edit, so reachable
+        answers in O(1)
         """
-        list_v[cur_v] = True                                                                                                # mark the current vertex as having been visited (True)
-        for neighbor in range(len(self.adj_matrix[cur_v])):
-            if self.adj_matrix[cur_v][neighbor] != 0 and list_v[neighbor] == False:                                         # if the neighbor is an actual neighbor (edge weight not 0) and unvisited, visit the neighbor recursively (dfs traversal),
-                cycle = self.dfs_cycle(neighbor, list_v)                                                                    # using neighbor as new current vertex, and passing visited list
-                if cycle == True:                                                                                           # if previous call returned true, return True
-                    return True
-            elif self.adj_matrix[cur_v][neighbor] != 0:                                                                     # if the neighbor has been visited and there is a directed edge (non-zero value) leading back to the previous node, considered a cycle -> return True
-                return True
-        list_v[cur_v] = False                                                                                               # if the recursive call returns false(no cycle found on current directed path), reset the visited vertex to False (resetting graph for different path)
-        return False
+        if self._reach is None:
+            self._reach = ReachabilityIndex(self)
+            self._observers.append(self._reach)
 
 
-    def dijkstra(self, src: int) -> []:
+    def reachable(self, src: int, dst: int) -> bool:
+        """
+        Method that returns True if there is a path from src to dst (a vertex always reaches itself), False otherwise or if
+        either vertex is not in the graph. Uses the reachability index if it is enabled, otherwise a depth-first search from
+        src that stops as soon as dst is found
+        """
+        if src < 0 or src > self.v_count-1 or dst < 0 or dst > self.v_count-1:
+            return False
+        if self._reach is not None:
+            return self._reach.reachable(src, dst)
+        return dst in self.iter_dfs(src, dst)
+
+
+    def enable_order_tracking(self, reject_cycles=False) -> None:
+        """
+        Method that turns on incremental topological order tracking (see TopologicalOrder). If reject_cycles is True, add_edge
+        ignores any new edge that would create a cycle, otherwise the edge is added and has_cycle reports True
+        """
+        if self._order is None:
+            self._order = TopologicalOrder(self)
+            self._observers.append(self._order)
+        self._order.reject_cycles = reject_cycles
+
+
+    def dijkstra(self, src: int, max_dist=None, k=None, targets=None):
         """
         Method that takes a starting vertex and calculates the shortest path length from that vertex to all other vertices
         in the graph. It returns a list containing the shortest path found (smallest sum of edges) between the source vertex
         to the destination vertex.
+        If the dijkstra cache is enabled, the result is memoised until the graph changes (the returned list is then shared
+        with the cache and must not be modified).
+        If any of the bounds below is given, the search stops as soon as one of them is reached and a tuple (dist, prev) of
+        dicts is returned instead, holding only the settled vertices: dist maps each one to its distance from src, prev to
+        the vertex it was reached from (None for src). See _bounded_dijkstra
+        - max_dist: only vertices at distance max_dist or less are settled
+        - k: only src and the k closest other vertices are settled
+        - targets: the search stops once every vertex in targets is settled
+        """
+        if max_dist is not None or k is not None or targets is not None:
+            return self._bounded_dijkstra(src, max_dist, k, targets)
+        if self.dijkstra_cache is not None:
+            return self.dijkstra_cache.get(self, src)
+        return self._dijkstra(src)
+
+
+    def _dijkstra(self, src: int) -> []:
+        """
+        Helper method that runs Dijkstra from src without the cache (see dijkstra). Mapped storage runs directly on the mapped
+        CSR arrays
         """
+        if self.storage == 'mapped':
+            return _csr_dijkstra(*self._csr, src)
         visited = [float('inf') for x in range(self.v_count)]
         visited[src] = 0
         pq = []
@@ -310,16 +932,653 @@ class DirectedGraph:
             if visited[v] == float('inf'):                                                                                  # if the current vertex hasn't been travelled to yet, add distance travelled to it to visited array
                 visited[v] = d
             if d <= visited[v]:                                                                                             # else if the vertex has been travelled to, but the distance travelled already is less than distance recorded for the current vertex
-                for n in range(self.v_count):                                                                               # for all vertices in graph
-                    n_d = self.adj_matrix[v][n]                                                                             # n_d is distance from current vertex to n (neighboring) vertex
-                    if n_d!= 0 and d+n_d < visited[n]:                                                                      # if n is actually neighbor of v (n_d not zero), and the total distance travelled to n (calculated by adding current edge n_d to total distance so far d)                                                              # push (neighbor, total distance) to priority queue, where total distance = distance travelled so far + distance from current vertex to neighbor)
+                for n, n_d in self._successors(v):                                                                          # for all neighbors n of v, n_d is distance from current vertex to n
+                    if d+n_d < visited[n]:                                                                                  # if n is actually neighbor of v (n_d not zero), and the total distance travelled to n (calculated by adding current edge n_d to total distance so far d)                                                              # push (neighbor, total distance) to priority queue, where total distance = distance travelled so far + distance from current vertex to neighbor)
                         visited[n] = d+n_d                                                                                  # adjust the value of the neighbor in visited array and,
                         heapq.heappush(pq, (d + n_d, n))                                                                    # push that neighbor with new smaller distance to priority queue
         return visited
 
 
+    def _bounded_dijkstra(self, src: int, max_dist=None, k=None, targets=None):
+        """
+        Helper method for the bounded modes of dijkstra. Distances and predecessors are kept in dicts that only hold the
+        vertices reached so far, so the cost follows the part of the graph explored instead of V. Returns (dist, prev)
+        limited to the settled vertices, or two empty dicts if src is not in the graph
+        """
+        if src < 0 or src > self.v_count-1:
+            return dict(), dict()
+        remaining = None if targets is None else set(targets)                                                               # targets not settled yet
+        best = {src: 0}                                                                                                     # best distance found so far for each reached vertex
+        via = {src: None}
+        dist = dict()                                                                                                       # settled vertices -> final distance
+        prev = dict()
+        pq = [(0, src)]
+        while pq:
+            d, v = heapq.heappop(pq)
+            if v in dist:                                                                                                   # outdated entry, v was settled with a shorter distance
+                continue
+            if max_dist is not None and d > max_dist:                                                                       # everything left is farther than the radius
+                break
+            if k is not None and len(dist) > k:                                                                             # src and k other vertices settled
+                break
+            dist[v] = d
+            prev[v] = via[v]
+            if remaining is not None:
+                remaining.discard(v)
+                if not remaining:
+                    break
+            for n, n_d in self._successors(v):
+                if n not in dist and d + n_d < best.get(n, float('inf')):
+                    best[n] = d + n_d
+                    via[n] = v
+                    heapq.heappush(pq, (d + n_d, n))
+        return dist, prev
+
+
+    def maintain_shortest_paths(self, src: int):
+        """
+        Method that computes the shortest paths from src once and returns a DynamicShortestPaths object that keeps them up to
+        date on every later add_edge, remove_edge and add_vertex (several sources can be maintained at the same time).
+        Raises ValueError if src is not in the graph
+        """
+        if src < 0 or src > self.v_count-1:
+            raise ValueError(f'vertex {src} is not in the graph')
+        sssp = DynamicShortestPaths(self, src)
+        self._observers.append(sssp)
+        return sssp
+
+
+    def enable_dijkstra_cache(self, max_entries=128) -> None:
+        """
+        Method that turns on memoisation of dijkstra results (see DijkstraCache), keeping at most max_entries sources
+        """
+        if self.dijkstra_cache is None:
+            self.dijkstra_cache = DijkstraCache(max_entries)
+        self.dijkstra_cache.max_entries = max_entries
+
+
+    def disable_dijkstra_cache(self) -> None:
+        """
+        Method that turns off memoisation of dijkstra results and drops the cached distances
+        """
+        self.dijkstra_cache = None
+
+
+    def shortest_path(self, src: int, dst: int, bidirectional=False, heuristic=None):
+        """
+        Method that takes a source and a destination vertex and returns a tuple (distance, path) with the length of the
+        shortest path from src to dst and the list of vertices on it. If dst can't be reached (or either vertex is not in the
+        graph), (inf, []) is returned. The search stops as soon as dst is settled instead of covering the whole graph.
+        - bidirectional=True runs Dijkstra from src forward and from dst backward (over incoming edges) at the same time
+        - heuristic runs A*: it is called with a vertex and must return a lower bound of the distance from it to dst
+        """
+        if src < 0 or src > self.v_count-1 or dst < 0 or dst > self.v_count-1:
+            return float('inf'), []
+        if src == dst:
+            return 0, [src]
+        if bidirectional:
+            return self._bidirectional_dijkstra(src, dst)
+        if heuristic is None:
+            heuristic = lambda v: 0                                                                                         # plain Dijkstra is A* without estimate
+        dist = {src: 0}                                                                                                     # best distance found so far for each reached vertex
+        prev = {src: None}                                                                                                  # vertex each reached vertex was reached from (for path rebuilding)
+        pq = [(heuristic(src), 0, src)]                                                                                     # (distance + estimate, distance, vertex)
+        while pq:
+            _, d, v = heapq.heappop(pq)
+            if d > dist[v]:                                                                                                 # outdated entry, vertex was reached again with a shorter distance
+                continue
+            if v == dst:                                                                                                    # destination settled -> its distance is final
+                return d, self._walk_back(prev, dst)
+            for n, n_d in self._successors(v):
+                if d + n_d < dist.get(n, float('inf')):
+                    dist[n] = d + n_d
+                    prev[n] = v
+                    heapq.heappush(pq, (d + n_d + heuristic(n), d + n_d, n))
+        return float('inf'), []
+
+
+    def _bidirectional_dijkstra(self, src: int, dst: int):
+        """
+        Helper method for shortest_path that grows one Dijkstra search from src over outgoing edges and one from dst over
+        incoming edges, always settling the next vertex of the side with the smaller distance. Every edge between the two
+        searches gives a candidate path; the search stops once the two smallest distances add up to the best candidate
+        """
+        dist = ({src: 0}, {dst: 0})                                                                                         # index 0 = forward search, 1 = backward search
+        prev = ({src: None}, {dst: None})
+        pqs = ([(0, src)], [(0, dst)])
+        settled = (set(), set())
+        best, meet = float('inf'), None
+        while pqs[0] and pqs[1]:
+            if pqs[0][0][0] + pqs[1][0][0] >= best:                                                                         # no shorter path can be found anymore
+                break
+            side = 0 if pqs[0][0][0] <= pqs[1][0][0] else 1
+            d, v = heapq.heappop(pqs[side])
+            if v in settled[side]:
+                continue
+            settled[side].add(v)
+            edges = self._successors(v) if side == 0 else self._predecessors(v)
+            for n, n_d in edges:
+                if d + n_d < dist[side].get(n, float('inf')):
+                    dist[side][n] = d + n_d
+                    prev[side][n] = v
+                    heapq.heappush(pqs[side], (d + n_d, n))
+                if n in dist[1 - side] and dist[side][n] + dist[1 - side][n] < best:                                        # n was reached by both searches -> candidate path through n
+                    best = dist[side][n] + dist[1 - side][n]
+                    meet = n
+        if meet is None:
+            return float('inf'), []
+        path = self._walk_back(prev[0], meet)
+        v = prev[1][meet]
+        while v is not None:                                                                                                # second half of the path follows the backward search to dst
+            path.append(v)
+            v = prev[1][v]
+        return best, path
+
+
+    def all_pairs_shortest_paths(self, method=None):
+        """
+        Method that returns the shortest path lengths between every pair of vertices as a V x V table: entry [src][dst] is
+        the distance from src to dst (inf if unreachable, 0 on the diagonal).
+        - 'floyd' runs Floyd-Warshall on the adjacency matrix with NumPy, relaxing the whole table through one intermediate
+          vertex per step (O(V^3) but vectorised)
+        - 'dijkstra' runs the heap-based dijkstra from every vertex (O(V (V + E) log V)), better for sparse graphs
+        By default Floyd-Warshall is picked when NumPy is installed and at least a quarter of all possible edges exist.
+        Returns a 2-D NumPy float array if NumPy is installed, otherwise a list of array('d') rows
+        """
+        if method is None:
+            edge_count = sum(self.out_degree())
+            method = 'floyd' if np is not None and edge_count * 4 >= self.v_count * self.v_count else 'dijkstra'
+        if method not in ('floyd', 'dijkstra'):
+            raise ValueError(f'unknown method: {method}')
+        if method == 'floyd' and np is not None:
+            if self.storage == 'numpy':
+                dist = self.adj_matrix.astype(float)                                                                        # astype copies, the graph's matrix is not touched
+            else:
+                dist = np.array([self._row(src) for src in range(self.v_count)], dtype=float).reshape(self.v_count, self.v_count)
+            dist[dist == 0] = np.inf                                                                                        # 0 in the matrix means no edge
+            np.fill_diagonal(dist, 0)
+            for k in range(self.v_count):                                                                                   # allow paths through vertex k: compare every entry with going src -> k -> dst
+                np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+            return dist
+        rows = [array('d', self.dijkstra(src)) for src in range(self.v_count)]
+        if np is not None:
+            return np.array(rows).reshape(self.v_count, self.v_count)
+        return rows
+
+
+    def dijkstra_many(self, sources, workers=None):
+        """
+        Generator method that runs dijkstra from every vertex in sources and yields (src, distances) tuples in the order of
+        sources, as soon as each result is ready. The searches are spread over a pool of worker processes (workers defaults to
+        the number of CPUs). The graph is copied once into a shared memory block in CSR layout (see _csr_arrays), which every
+        worker maps read-only, so the adjacency data is not pickled for each task. With workers=1 the searches run in this process
+        """
+        sources = list(sources)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(sources) < 2:
+            for src in sources:
+                yield src, self.dijkstra(src)
+            return
+        chunk = max(1, len(sources) // (workers * 4))
+        with shared_arrays(self._csr_arrays()) as layout:                                                                   # offsets, targets and weights copied once into shared memory
+            with Pool(workers, initializer=attach_shared_arrays, initargs=(layout,)) as pool:
+                for result in pool.imap(_shared_dijkstra, sources, chunk):
+                    yield result
+
+
+    def _csr_arrays(self):
+        """
+        Helper method that returns the edges as three flat arrays in compressed sparse row (CSR) layout: the successors of
+        vertex v are targets[offsets[v]:offsets[v+1]], with the matching weights at the same indexes. Weights are stored as
+        integers ('q') unless some weight is a float ('d')
+        """
+        if self.storage == 'mapped':                                                                                        # copy the mapped arrays as they are
+            return tuple(array(view.format, view.tobytes()) for view in self._csr)
+        if np is not None:                                                                                                  # built with whole-array operations, then copied out as raw bytes
+            offsets, targets, weights = self._csr_vectorised(True)
+            weights = weights.astype(np.float64 if weights.dtype.kind == 'f' else np.int64, copy=False)
+            typecode = 'd' if weights.dtype.kind == 'f' else 'q'
+            return array('q', offsets.tobytes()), array('q', targets.tobytes()), array(typecode, weights.tobytes())
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = []
+        for src in range(self.v_count):
+            for dst, weight in self._successors(src):
+                targets.append(dst)
+                weights.append(weight)
+            offsets.append(len(targets))
+        typecode = 'q' if all(isinstance(weight, int) for weight in weights) else 'd'
+        return offsets, targets, array(typecode, weights)
+
+
+    def _walk_back(self, prev: dict, v: int) -> []:
+        """
+        Helper method that follows the prev links from v back to the start of a search and returns the path start -> v
+        """
+        path = []
+        while v is not None:
+            path.append(v)
+            v = prev[v]
+        path.reverse()
+        return path
+
+
+
+
+
+def _parse_weight(fields: []):
+    """
+    Function that returns the weight field of an edge read from a file (third field, 1 if missing) as an int, or as a float
+    if it isn't a whole number
+    """
+    if len(fields) < 3:
+        return 1
+    try:
+        return int(fields[2])
+    except ValueError:
+        return float(fields[2])
+
+
+def _csr_dijkstra(offsets, targets, weights, src: int) -> []:
+    """
+    Function that runs Dijkstra from src over a graph given as CSR arrays (see DirectedGraph._csr_arrays) and returns the list
+    of distances to every vertex (inf if unreachable). Works on any indexable sequences, e.g. arrays or shared memoryviews
+    """
+    dist = [float('inf') for x in range(len(offsets) - 1)]
+    dist[src] = 0
+    pq = [(0, src)]
+    while pq:
+        d, v = heapq.heappop(pq)
+        if d > dist[v]:                                                                                                     # outdated entry
+            continue
+        for i in range(offsets[v], offsets[v + 1]):
+            n = targets[i]
+            if d + weights[i] < dist[n]:
+                dist[n] = d + weights[i]
+                heapq.heappush(pq, (dist[n], n))
+    return dist
+
+
+def _shared_dijkstra(src: int):
+    """
+    Function run by the dijkstra_many workers for one source: returns (src, distances) computed on the shared CSR arrays
+    (see graph_io.shared_arrays)
+    """
+    offsets, targets, weights = worker_arrays()
+    return src, _csr_dijkstra(offsets, targets, weights, src)
+
+
+class DijkstraCache:
+    """
+    Class that memoises DirectedGraph.dijkstra results
+    - results are keyed by (source, graph version); the version counter changes on every add_vertex and every edge change,
+      so a cached distance list is only returned while the graph is unchanged since it was computed
+    - at most max_entries results are kept, the least recently used one is evicted first
+    - hits and misses count the lookups answered from the cache and the ones that ran Dijkstra
+    """
+
+    def __init__(self, max_entries=128):
+        """
+        Create an empty cache
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()                                                                                        # (src, version) -> distances, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+
+    def get(self, graph, src: int) -> []:
+        """
+        Method that returns the distances from src in graph, from the cache if they were computed for the current version
+        """
+        key = (src, graph.version)
+        distances = self.entries.get(key)
+        if distances is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return distances
+        self.misses += 1
+        if self.entries and next(reversed(self.entries))[1] != graph.version:                                               # graph changed since the last result -> none of the entries can be hit again
+            self.entries.clear()
+        distances = graph._dijkstra(src)
+        self.entries[key] = distances
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return distances
+
+
+    def __len__(self):
+        """
+        Return the number of cached results
+        """
+        return len(self.entries)
+
+
+class TopologicalOrder:
+    """
+    Class that keeps a topological order of a DirectedGraph up to date while edges and vertices are added
+    - order lists the vertices so that every edge goes forward, position maps each vertex to its index in order
+    - a new edge that already goes forward costs O(1); an edge src -> dst going backward triggers a search from dst over the
+      vertices placed up to src (Marchetti-Spaccamela et al.). If src is found, the edge closed a cycle; otherwise the vertices
+      found are moved, keeping their relative order, right after src, which only touches the part of the order between dst and src
+    - removing an edge never invalidates the order. While the graph has a cycle no order is kept; removing an edge then marks
+      the index stale, and the next query rebuilds it with Kahn's algorithm
+    """
+
+    def __init__(self, graph):
+        """
+        Build the order of the given graph once
+        """
+        self.graph = graph
+        self.reject_cycles = False
+        self.order = []
+        self.position = []
+        self.cyclic = False
+        self.stale = True
+        self.rebuild()
+
+
+    def rebuild(self) -> None:
+        """
+        Method that recomputes the order from scratch (or records that there is a cycle)
+        """
+        order = self.graph._kahn_order()
+        self.cyclic = order is None
+        self.stale = False
+        self.order = order or []
+        self.position = [0 for x in range(self.graph.v_count)]
+        for index, vertex in enumerate(self.order):
+            self.position[vertex] = index
+
+
+    def has_cycle(self) -> bool:
+        """
+        Method that returns True if the graph has a cycle (rebuilding first if an edge was removed from a cyclic graph)
+        """
+        if self.stale:
+            self.rebuild()
+        return self.cyclic
+
+
+    def vertex_added(self, v: int) -> None:
+        """
+        Method called after a new vertex is added -> it has no edges, so it can go at the end of the order
+        """
+        self.position.append(len(self.order))
+        self.order.append(v)
+
+
+    def edge_changed(self, src: int, dst: int, old_weight: int, new_weight: int) -> None:
+        """
+        Method called after the weight of the edge src -> dst changed. Only adding or removing the edge matters for the order
+        """
+        if old_weight != 0 and new_weight == 0:
+            if self.cyclic:
+                self.stale = True
+        elif old_weight == 0 and new_weight != 0:
+            if self.cyclic or self.stale:
+                return
+            if self.position[src] < self.position[dst]:                                                                     # edge already goes forward
+                return
+            found = self._forward(dst, self.position[src])
+            if src in found:
+                self.cyclic = True
+                return
+            self._move_after(found, self.position[dst], self.position[src])
+
+
+    def creates_cycle(self, src: int, dst: int) -> bool:
+        """
+        Method that returns True if adding the edge src -> dst would create a cycle (src can already be reached from dst)
+        """
+        if self.stale or self.cyclic:
+            return src in self.graph.iter_dfs(dst, src)
+        if self.position[src] < self.position[dst]:
+            return False
+        return src in self._forward(dst, self.position[src])
+
+
+    def _forward(self, start: int, limit: int) -> set:
+        """
+        Helper method that returns the set of vertices reachable from start through vertices placed at or before limit
+        """
+        found = {start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for neighbor, _ in self.graph._successors(current):
+                if neighbor not in found and self.position[neighbor] <= limit:
+                    found.add(neighbor)
+                    stack.append(neighbor)
+        return found
+
+
+    def _move_after(self, found: set, low: int, high: int) -> None:
+        """
+        Helper method that reorders positions low..high so the vertices in found come after all the others, each group
+        keeping its relative order
+        """
+        region = self.order[low:high + 1]
+        region = [v for v in region if v not in found] + [v for v in region if v in found]
+        for index, vertex in enumerate(region, low):
+            self.order[index] = vertex
+            self.position[vertex] = index
+
+
+class DynamicShortestPaths:
+    """
+    Class that keeps the result of dijkstra from one source of a DirectedGraph up to date while edges change
+    - dist is the same list dijkstra(src) returns, parent[v] is the vertex before v on its shortest path (None for src and
+      unreachable vertices), children holds the reverse links, so the shortest-path tree can be walked both ways
+    - an edge that is added or gets cheaper only matters if it gives dst a shorter distance; then a Dijkstra search starts
+      from dst alone and stops where distances don't improve, so only the region that got closer is touched
+    - an edge of the tree that is removed or gets more expensive invalidates the subtree hanging below it: those vertices
+      are reset, take their best distance over incoming edges from the rest of the tree, and a Dijkstra search limited to
+      them repairs the subtree. Changes to edges outside the tree can't make any distance longer and are ignored
+    """
+
+    def __init__(self, graph, src: int):
+        """
+        Run Dijkstra from src once to build the distances and the tree
+        """
+        self.graph = graph
+        self.src = src
+        self.dist = [float('inf') for x in range(graph.v_count)]
+        self.parent = [None for x in range(graph.v_count)]
+        self.children = [set() for x in range(graph.v_count)]
+        dist, prev = graph._bounded_dijkstra(src)
+        for v, d in dist.items():
+            self.dist[v] = d
+            self._set_parent(v, prev[v])
+
+
+    def path_to(self, v: int) -> []:
+        """
+        Method that returns the vertices on the current shortest path from the source to v, or an empty list if v can't be
+        reached
+        """
+        if v < 0 or v > len(self.dist) - 1 or self.dist[v] == float('inf'):
+            return []
+        path = []
+        while v is not None:
+            path.append(v)
+            v = self.parent[v]
+        path.reverse()
+        return path
+
+
+    def detach(self) -> None:
+        """
+        Method that stops the updates (the object keeps its last distances)
+        """
+        if self in self.graph._observers:
+            self.graph._observers.remove(self)
+
+
+    def vertex_added(self, v: int) -> None:
+        """
+        Method called after a new vertex is added -> it has no edges, so it can't be reached
+        """
+        self.dist.append(float('inf'))
+        self.parent.append(None)
+        self.children.append(set())
+
+
+    def edge_changed(self, src: int, dst: int, old_weight: int, new_weight: int) -> None:
+        """
+        Method called after the weight of the edge src -> dst changed (0 = no edge)
+        """
+        if new_weight != 0 and (old_weight == 0 or new_weight < old_weight):                                                # edge added or cheaper
+            if self.dist[src] + new_weight < self.dist[dst]:
+                self.dist[dst] = self.dist[src] + new_weight
+                self._set_parent(dst, src)
+                self._repair([(self.dist[dst], dst)])
+        elif old_weight != 0 and (new_weight == 0 or new_weight > old_weight) and self.parent[dst] == src:                  # tree edge removed or more expensive
+            self._repair(self._reset_subtree(dst))
+
+
+    def _reset_subtree(self, root: int) -> []:
+        """
+        Helper method that cuts the subtree of root out of the tree, sets the distances in it to inf and then gives each of
+        its vertices the best distance over an incoming edge from a vertex outside the subtree. Returns the heap of vertices
+        that got a distance again
+        """
+        affected = [root]
+        for v in affected:                                                                                                  # the list grows while it is walked -> whole subtree
+            affected.extend(self.children[v])
+        for v in affected:
+            self.dist[v] = float('inf')
+            self._set_parent(v, None)
+        pq = []
+        for v in affected:
+            for p, weight in self.graph._predecessors(v):
+                if self.dist[p] + weight < self.dist[v]:                                                                    # vertices of the subtree are still inf here
+                    self.dist[v] = self.dist[p] + weight
+                    self._set_parent(v, p)
+            if self.dist[v] != float('inf'):
+                pq.append((self.dist[v], v))
+        heapq.heapify(pq)
+        return pq
+
+
+    def _repair(self, pq: []) -> None:
+        """
+        Helper method that runs Dijkstra from the (distance, vertex) entries in the heap pq, only going on from vertices
+        whose distance got shorter
+        """
+        while pq:
+            d, v = heapq.heappop(pq)
+            if d > self.dist[v]:                                                                                            # outdated entry
+                continue
+            for n, weight in self.graph._successors(v):
+                if d + weight < self.dist[n]:
+                    self.dist[n] = d + weight
+                    self._set_parent(n, v)
+                    heapq.heappush(pq, (d + weight, n))
 
 
+    def _set_parent(self, v: int, p) -> None:
+        """
+        Helper method that makes p the parent of v in the tree (None to cut v off), keeping children in sync
+        """
+        if self.parent[v] is not None:
+            self.children[self.parent[v]].discard(v)
+        self.parent[v] = p
+        if p is not None:
+            self.children[p].add(v)
+
+
+class ReachabilityIndex:
+    """
+    Class that keeps the transitive closure of a DirectedGraph, so "is there a path from u to v" is a table lookup
+    - the graph is compressed to its strongly connected components (every vertex of a component reaches the same vertices),
+      comp maps each vertex to its component and rows[c] is a bitset (bytes, bit d = component d is reachable from c)
+    - reachable(u, v) reads one bit of rows[comp[u]] in O(1)
+    - a new edge u -> v is added incrementally: every component that reaches u (and didn't reach v yet) gets rows[comp[v]]
+      OR-ed into its row (O(C) bit checks plus one O(C / 8) OR per changed row). The components are not merged when the
+      edge closes a cycle; the rows stay exact, only the compression is lost until the next rebuild
+    - removing an edge marks the index stale, and the next query rebuilds it with Tarjan's algorithm
+    - memory is C^2 / 8 bytes for C components
+    """
+
+    def __init__(self, graph):
+        """
+        Build the index of the given graph once
+        """
+        self.graph = graph
+        self.comp = []
+        self.rows = []
+        self.stale = True
+        self.rebuild()
+
+
+    def rebuild(self) -> None:
+        """
+        Method that recomputes the components and the closure from scratch. Tarjan numbers the components so that all
+        edges go to lower ids, so each row can be finished by OR-ing the already finished rows of its successor components
+        """
+        graph = self.graph
+        self.comp, count = graph._scc_labels()
+        members = [[] for x in range(count)]
+        for vertex, c in enumerate(self.comp):
+            members[c].append(vertex)
+        reach = []                                                                                                          # rows as Python ints while building (fast OR)
+        for c in range(count):
+            targets = {self.comp[n] for vertex in members[c] for n, _ in graph._successors(vertex)}
+            targets.discard(c)
+            row = 1 << c
+            for d in targets:
+                row |= reach[d]
+            reach.append(row)
+        size = (count + 7) // 8
+        self.rows = [row.to_bytes(size, 'little') for row in reach]
+        self.stale = False
+
+
+    def reachable(self, src: int, dst: int) -> bool:
+        """
+        Method that returns True if dst can be reached from src (rebuilding first if an edge was removed)
+        """
+        if self.stale:
+            self.rebuild()
+        return self._has_bit(self.rows[self.comp[src]], self.comp[dst])
+
+
+    def vertex_added(self, v: int) -> None:
+        """
+        Method called after a new vertex is added -> it gets its own component that only reaches itself
+        """
+        if self.stale:
+            return
+        c = len(self.rows)
+        self.comp.append(c)
+        self.rows.append((1 << c).to_bytes(c // 8 + 1, 'little'))
+
+
+    def edge_changed(self, src: int, dst: int, old_weight: int, new_weight: int) -> None:
+        """
+        Method called after the weight of the edge src -> dst changed. Only adding or removing the edge matters
+        """
+        if old_weight != 0 and new_weight == 0:
+            self.stale = True
+        elif old_weight == 0 and new_weight != 0 and not self.stale:
+            c_src, c_dst = self.comp[src], self.comp[dst]
+            if self._has_bit(self.rows[c_src], c_dst):                                                                      # dst was already reachable -> closure unchanged
+                return
+            added = int.from_bytes(self.rows[c_dst], 'little')
+            size = (len(self.rows) + 7) // 8
+            for c, row in enumerate(self.rows):
+                if self._has_bit(row, c_src) and not self._has_bit(row, c_dst):                                             # c reaches src, so now it also reaches everything dst reaches
+                    self.rows[c] = (int.from_bytes(row, 'little') | added).to_bytes(size, 'little')
+
+
+    def _has_bit(self, row: bytes, c: int) -> bool:
+        """
+        Helper method that returns True if bit c is set in the bitset row
+        """
+        return c >> 3 < len(row) and row[c >> 3] >> (c & 7) & 1 == 1
+
 
 if __name__ == '__main__':
 
@@ -418,3 +1677,59 @@ if __name__ == '__main__':
              (8, 2, 9), (10, 7, 5), (11, 12, 4), (12, 0, 16)]
     g = DirectedGraph(edges)
     print(g.get_edges(), g.has_cycle(), sep='\n')
+
+    print("\nshortest_path() example 1")
+    print("-------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    for src, dst in [(0, 2), (2, 0), (4, 1), (1, 1)]:
+        print(f'{src} -> {dst}', g.shortest_path(src, dst), g.shortest_path(src, dst, bidirectional=True))
+
+
+    print("\nstrongly_connected_components() / condensation() example 1")
+    print("----------------------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    g.add_vertex()
+    g.add_edge(2, 5, 4)
+    print(g.strongly_connected_components())
+    print(g.condensation())
+    g.remove_edge(3, 2)
+    print(g.strongly_connected_components())
+    print(g.condensation())
+
+
+    print("\nmaintain_shortest_paths() example 1")
+    print("-----------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    sssp = g.maintain_shortest_paths(4)
+    print(sssp.dist, sssp.dist == g.dijkstra(4))
+    for action, src, dst, weight in [('add', 4, 1, 2), ('remove', 4, 3, 0), ('add', 0, 2, 1), ('add', 4, 1, 30), ('remove', 4, 0, 0)]:
+        if action == 'add':
+            g.add_edge(src, dst, weight)
+        else:
+            g.remove_edge(src, dst)
+        print(f'{action} {src} -> {dst}', sssp.dist, sssp.dist == g.dijkstra(4))
+    g.add_vertex()
+    g.add_edge(1, 5, 6)
+    print('add vertex 5, add 1 -> 5', sssp.dist, sssp.dist == g.dijkstra(4))
+
+
+    print("\nenable_reachability_index() / reachable() example 1")
+    print("---------------------------------------------------")
+    edges = [(0, 1, 10), (4, 0, 12), (1, 4, 15), (4, 3, 3),
+             (3, 1, 5), (2, 1, 23), (3, 2, 7)]
+    g = DirectedGraph(edges)
+    g.enable_reachability_index()
+    pairs = [(0, 2), (2, 0), (2, 3), (3, 0)]
+    print([g.reachable(u, v) for u, v in pairs])
+    for action, src, dst in [('remove', 1, 4), ('remove', 3, 2), ('add', 2, 4), ('remove', 4, 3)]:
+        if action == 'add':
+            g.add_edge(src, dst, 1)
+        else:
+            g.remove_edge(src, dst)
+        print(f'{action} {src} -> {dst}', [g.reachable(u, v) for u, v in pairs])
@@ -0,0 +1,166 @@
+# Course: CS261 - Data Structures
+# Author: Theresa Quach
+# Assignment: Graph Implementation File Helpers
+# Description: Helper functions shared by the undirected and directed graph implementations for reading edge list files
+#              for saving/loading binary snapshots, and for sharing arrays with worker processes
+
+from array import array
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+import mmap
+import struct
+import sys
+
+
+def read_edge_chunks(path, delimiter=None, chunk_size=1 << 20):
+    """
+    Generator function that reads a text file with one edge per line and yields the edges in chunks, each chunk being a
+    list of edges read from about chunk_size bytes of the file (so the whole file is never held in memory). Each edge is a
+    list of its fields as strings. Fields are split on the given delimiter; without one, lines containing a comma are split
+    on commas (CSV) and other lines on whitespace. Blank lines and lines starting with # are skipped.
+    """
+    with open(path) as file:
+        while True:
+            lines = file.readlines(chunk_size)                                                                          # whole lines adding up to about chunk_size bytes
+            if not lines:
+                return
+            chunk = []
+            for line in lines:
+                line = line.strip()
+                if not line or line[0] == '#':
+                    continue
+                if delimiter is None and ',' not in line:
+                    chunk.append(line.split())
+                else:
+                    chunk.append([field.strip() for field in line.split(delimiter or ',')])
+            yield chunk
+
+
+def read_edges(path, delimiter=None, chunk_size=1 << 20):
+    """
+    Generator function that streams the edges of an edge list file one at a time (see read_edge_chunks)
+    """
+    for chunk in read_edge_chunks(path, delimiter, chunk_size):
+        yield from chunk
+
+
+# ------------------------------------------------------------------ #
+# Binary snapshots
+#
+# Layout (all numbers little-endian):
+#   header   magic b'CS261GPH', format version (uint32), graph kind (uint32), section count (uint32), padding (uint32)
+#   table    one entry per section: name (8 bytes, NUL padded), array typecode (8 bytes, NUL padded),
+#            byte offset of the data (uint64), number of items (uint64)
+#   data     the raw items of every section, each starting at a multiple of 8 bytes
+
+SNAPSHOT_MAGIC = b'CS261GPH'
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct('<8sIIII')
+_ENTRY = struct.Struct('<8s8sQQ')
+
+
+def write_snapshot(path, kind: int, sections) -> None:
+    """
+    Function that writes a binary snapshot file. kind identifies the graph class, sections is a list of (name, array) pairs
+    (the arrays must be array.array objects, their typecode is stored with them)
+    """
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    entries = []
+    for name, data in sections:
+        offset += -offset % 8                                                                                           # align every section to 8 bytes
+        entries.append(_ENTRY.pack(name.encode(), data.typecode.encode(), offset, len(data)))
+        offset += len(data) * data.itemsize
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, kind, len(sections), 0))
+        file.write(b''.join(entries))
+        for name, data in sections:
+            file.write(b'\0' * (-file.tell() % 8))
+            file.write(data.tobytes() if sys.byteorder == 'little' else _swapped(data).tobytes())
+
+
+def read_snapshot(path, use_mmap=True):
+    """
+    Function that opens a binary snapshot file and returns (kind, sections, buffer), where sections maps each section name
+    to a memoryview cast to the section's typecode. With use_mmap the file is memory-mapped read-only and the memoryviews
+    point straight into the mapping (nothing is copied; pages are read from disk when first used), otherwise the file is read
+    into memory. The buffer (mmap or bytes) must be kept alive while the memoryviews are used
+    """
+    with open(path, 'rb') as file:
+        if use_mmap:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = file.read()
+    view = memoryview(buffer)
+    magic, version, kind, count, _ = _HEADER.unpack_from(view, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f'{path} is not a graph snapshot')
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f'unsupported snapshot format version {version} in {path}')
+    sections = dict()
+    for index in range(count):
+        name, typecode, offset, length = _ENTRY.unpack_from(view, _HEADER.size + index * _ENTRY.size)
+        typecode = typecode.rstrip(b'\0').decode()
+        data = view[offset:offset + length * array(typecode).itemsize].cast(typecode)
+        if sys.byteorder != 'little':                                                                                   # only big-endian machines pay for a converted copy
+            data = memoryview(_swapped(array(typecode, data)))
+        sections[name.rstrip(b'\0').decode()] = data
+    return kind, sections, buffer
+
+
+def _swapped(data):
+    """
+    Function that returns a byte-swapped copy of an array (snapshots are always stored little-endian)
+    """
+    data = array(data.typecode, data)
+    data.byteswap()
+    return data
+
+
+# ------------------------------------------------------------------ #
+# Shared memory arrays
+#
+# Used by the worker pools of DirectedGraph.dijkstra_many and UndirectedGraph.connected_components: the parent process
+# copies its CSR arrays once into one shared memory block, and every worker maps that block instead of receiving a pickled copy
+
+_worker_arrays = None                                                                                                   # (shared memory, memoryviews) in each worker process
+
+
+@contextmanager
+def shared_arrays(arrays):
+    """
+    Context manager that copies a list of array.array objects one after the other (each starting at a multiple of 8 bytes)
+    into a new shared memory block and yields its layout, a small picklable tuple to pass to attach_shared_arrays in the
+    worker processes. The block is closed and freed on exit
+    """
+    entries = []
+    offset = 0
+    for data in arrays:
+        offset += -offset % 8
+        entries.append((data.typecode, offset, len(data)))
+        offset += len(data) * data.itemsize
+    shm = SharedMemory(create=True, size=max(1, offset))
+    try:
+        for data, (_, start, _) in zip(arrays, entries):
+            shm.buf[start:start + len(data) * data.itemsize] = data.tobytes()
+        yield (shm.name, tuple(entries))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def attach_shared_arrays(layout) -> None:
+    """
+    Function used as the initializer of worker processes: maps the shared memory block described by layout (see
+    shared_arrays) and keeps one typed memoryview per array, without copying anything (see worker_arrays)
+    """
+    global _worker_arrays
+    name, entries = layout
+    shm = SharedMemory(name=name)
+    _worker_arrays = (shm, [shm.buf[start:start + length * array(typecode).itemsize].cast(typecode) for typecode, start, length in entries])
+
+
+def worker_arrays() -> []:
+    """
+    Function that returns the list of memoryviews attached by attach_shared_arrays in this worker process
+    """
+    return _worker_arrays[1]
@@ -3,7 +3,22 @@
 # Assignment: Undirected Graph Implementation
 # Description: Implementation of an undirected graph using an adjacency list to store the vertices and edges of the graph
 
+from array import array
+from bisect import bisect_left
 from collections import deque
+from collections.abc import Mapping
+from itertools import chain
+from multiprocessing import Pool
+import os
+
+from graph_io import attach_shared_arrays, read_edges, read_snapshot, shared_arrays, worker_arrays, write_snapshot
+
+try:                                                                                                                        # NumPy is optional: only used for the result of validate_paths, which is a list without it
+    import numpy as np
+except ImportError:
+    np = None
+
+UNDIRECTED_SNAPSHOT = 1                                                                                                     # graph kind stored in snapshot files written by UndirectedGraph.save
 
 class UndirectedGraph:
     """
@@ -14,29 +29,156 @@ class UndirectedGraph:
     - vertex names are strings
     """
 
-    def __init__(self, start_edges=None):
+    def __init__(self, start_edges=None, storage='list', track_components=False):
         """
-        Store graph info as adjacency list
+        Store graph info as adjacency list. The storage argument picks the container used for each vertex's neighbors:
+        'list' (default) keeps plain lists, 'hash' keeps insertion-ordered dicts (used as ordered sets) so that edge
+        lookups, insertions and removals are O(1) even for vertices with many neighbors, 'compact' interns every vertex name
+        to an integer id once and keeps all neighbor ids in two flat CSR arrays (4 bytes per entry); adj_list is then a
+        read-only view that translates ids back to names (see CompactAdjacency). Graphs opened with load(path, mmap=True)
+        use the read-only 'mapped' mode: the same view, reading the neighbor ids straight from the memory-mapped file.
+        If track_components is True, connected components are kept up to date on every edit (see ComponentIndex)
         """
-        self.adj_list = dict()
+        if storage not in ('list', 'hash', 'compact'):
+            raise ValueError(f'unknown storage mode: {storage}')
+        self.storage = storage
+        self.adj_list = dict() if storage != 'compact' else CompactAdjacency()
+        self._sorted_cache = dict()                                                                                         # vertex -> alphabetized neighbor list, rebuilt lazily after the vertex's edges change
+        self.edge_count = 0                                                                                                 # number of edges, kept current by add_edge/remove_edge/remove_vertex
+        self._components = None                                                                                             # ComponentIndex while component tracking is enabled
+        self._edge_index = None                                                                                             # (ids, id count, edge key set) for validate_paths, dropped on every change
 
         # populate graph with initial vertices and edges (if provided)
         # before using, implement add_vertex() and add_edge() methods
         if start_edges is not None:
             for u, v in start_edges:
                 self.add_edge(u, v)
+            if storage == 'compact':                                                                                        # write the rows edited while adding the edges back into the flat arrays
+                self.adj_list.compact()
+        if track_components:                                                                                                # label the components once, after the initial edges
+            self.enable_component_tracking()
 
     def __str__(self):
         """
         Return content of the graph in human-readable form
         """
-        out = [f'{v}: {self.adj_list[v]}' for v in self.adj_list]
+        out = [f'{v}: {list(self.adj_list[v])}' for v in self.adj_list]
         out = '\n  '.join(out)
         if len(out) < 70:
             out = out.replace('\n  ', ', ')
             return f'GRAPH: {{{out}}}'
         return f'GRAPH: {{\n  {out}}}'
 
+    @classmethod
+    def from_edges(cls, edges, trusted=True, storage='list', track_components=False):
+        """
+        Method that builds a graph from an iterable of (u, v) edges, consuming it only once (so it can be a generator).
+        If trusted is True the input is declared clean (no loops, no duplicate edges in either direction) and every edge is
+        linked directly, without the checks done by add_edge. Otherwise each edge goes through add_edge.
+        Component tracking, if asked for, is turned on once after all edges are in
+        """
+        g = cls(storage=storage)
+        if not trusted:
+            for u, v in edges:
+                g.add_edge(u, v)
+        elif storage == 'compact':                                                                                          # collect the edges as id pairs, then fill the CSR arrays in one pass
+            adj_list = g.adj_list
+            ids = adj_list.ids
+            firsts = array('i')
+            seconds = array('i')
+            for u, v in edges:
+                i = ids.get(u)
+                if i is None:
+                    i = adj_list.intern(u)
+                j = ids.get(v)
+                if j is None:
+                    j = adj_list.intern(v)
+                firsts.append(i)
+                seconds.append(j)
+            adj_list.link_ids(firsts, seconds)
+            g.edge_count = len(firsts)
+        else:
+            adj_list = g.adj_list
+            new_neighbors = list if storage == 'list' else dict
+            for u, v in edges:
+                u_neighbors = adj_list.get(u)                                                                               # create the vertices on first sight
+                if u_neighbors is None:
+                    u_neighbors = adj_list[u] = new_neighbors()
+                v_neighbors = adj_list.get(v)
+                if v_neighbors is None:
+                    v_neighbors = adj_list[v] = new_neighbors()
+                if storage == 'list':
+                    u_neighbors.append(v)
+                    v_neighbors.append(u)
+                else:
+                    u_neighbors[v] = None
+                    v_neighbors[u] = None
+                g.edge_count += 1
+        if track_components:
+            g.enable_component_tracking()
+        return g
+
+    @classmethod
+    def from_edge_file(cls, path, delimiter=None, trusted=True, storage='list', track_components=False):
+        """
+        Method that builds a graph from a text file with one edge (two vertex names) per line. The file is streamed in chunks
+        (see graph_io.read_edge_chunks for the accepted formats) and the edges are passed on to from_edges
+        """
+        edges = ((fields[0], fields[1]) for fields in read_edges(path, delimiter))
+        return cls.from_edges(edges, trusted, storage, track_components)
+
+    @classmethod
+    def load(cls, path, mmap=True, storage='list'):
+        """
+        Method that opens a snapshot file written by save. With mmap=True the file is memory-mapped and the graph reads its
+        neighbor ids directly from the mapping (read-only 'mapped' storage: only the vertex name table is turned into
+        Python strings), so it can be traversed right away without rebuilding anything. With mmap=False the file is read
+        and copied into a normal, editable graph with the given storage mode
+        """
+        kind, sections, buffer = read_snapshot(path, mmap)
+        if kind != UNDIRECTED_SNAPSHOT:
+            raise ValueError(f'{path} is not an undirected graph snapshot')
+        offsets, targets = sections['offsets'], sections['targets']
+        name_offsets, name_bytes = sections['nameoffs'], sections['names']
+        names = [bytes(name_bytes[name_offsets[i]:name_offsets[i + 1]]).decode() for i in range(len(name_offsets) - 1)]
+        g = cls(storage='compact' if mmap else storage)
+        g.edge_count = len(targets) // 2
+        if mmap:
+            g.storage = 'mapped'
+            g.adj_list.names = names
+            g.adj_list.ids = {name: i for i, name in enumerate(names)}
+            g.adj_list.offsets, g.adj_list.targets = offsets, targets                                                       # the CSR arrays are read straight from the mapping
+            g._snapshot = buffer                                                                                            # keeps the mapping open as long as the graph exists
+        elif storage == 'compact':
+            g.adj_list.names = names
+            g.adj_list.ids = {name: i for i, name in enumerate(names)}
+            g.adj_list.offsets, g.adj_list.targets = array('q', offsets.tobytes()), array('i', targets.tobytes())
+        else:
+            for i, name in enumerate(names):
+                neighbors = [names[j] for j in targets[offsets[i]:offsets[i + 1]]]
+                g.adj_list[name] = neighbors if storage == 'list' else dict.fromkeys(neighbors)
+        return g
+
+
+    def save(self, path) -> None:
+        """
+        Method that writes the graph to a binary snapshot file (see graph_io for the layout): the vertex names as a UTF-8 table,
+        and the adjacency in CSR layout, i.e. the neighbor ids of every vertex one after the other (targets) plus where each
+        vertex's neighbors start (offsets). Vertex and neighbor order are kept, so a loaded graph behaves exactly the same
+        """
+        index = {vertex: i for i, vertex in enumerate(self.adj_list)}
+        offsets = array('q', [0])
+        targets = array('i')
+        name_offsets = array('q', [0])
+        name_bytes = bytearray()
+        for vertex in self.adj_list:
+            targets.extend(index[neighbor] for neighbor in self.adj_list[vertex])
+            offsets.append(len(targets))
+            name_bytes += vertex.encode()
+            name_offsets.append(len(name_bytes))
+        write_snapshot(path, UNDIRECTED_SNAPSHOT, [('offsets', offsets), ('targets', targets),
+                                                   ('nameoffs', name_offsets), ('names', array('B', name_bytes))])
+
     # ------------------------------------------------------------------ #
 
     def add_vertex(self, v: str) -> None:
@@ -45,7 +187,14 @@ class UndirectedGraph:
         nothing is added.
         """
         if v not in self.adj_list:
-            self.adj_list[v] = []
+            self._check_writable()
+            self._edge_index = None
+            if self.storage == 'compact':
+                self.adj_list.intern(v)
+            else:
+                self.adj_list[v] = [] if self.storage == 'list' else {}
+            if self._components is not None:
+                self._components.vertex_added(v)
 
 
     def add_edge(self, u: str, v: str) -> None:
@@ -56,16 +205,15 @@ class UndirectedGraph:
         """
         if u == v:
             return
-        if u not in self.adj_list:                                                                                          # Adding edge/direct neighbor to key 'u'
-            self.adj_list[u] = [v]                                                                                          # if u doesn't exist, create it and add edge
-        else:
-            if v not in self.adj_list[u]:                                                                                   # if u exists, add edge to preexisting neighbor list
-                self.adj_list[u].append(v)
-        if v not in self.adj_list:                                                                                          # Adding edge/direct neighbor to key 'v'
-            self.adj_list[v] = [u]                                                                                          # if v doesn't exist, create it and add edge
-        else:
-            if u not in self.adj_list[v]:                                                                                   # if v exists, add edge by appending to preexisting list
-                self.adj_list[v].append(u)
+        self.add_vertex(u)                                                                                                  # create u and v if they don't exist yet (does nothing otherwise)
+        self.add_vertex(v)
+        if v in self.adj_list[u]:                                                                                           # edge already exists -> duplicates not allowed
+            return
+        self._link(u, v)                                                                                                    # add each vertex to the other's neighbors
+        self._link(v, u)
+        self.edge_count += 1
+        if self._components is not None:
+            self._components.edge_added(u, v)
 
 
     def remove_edge(self, v: str, u: str) -> None:
@@ -73,28 +221,140 @@ class UndirectedGraph:
         Method that takes two vertices and removes the edge between them. If one or both vertices don't exist with in the graph,
         or if the edge between them doesn't exist, method does nothing.
         """
+        self._check_writable()
         if v == u:                                                                                                          # if vertices are the same (no loops) = do nothing
             return
         if v not in self.adj_list:                                                                                          # Check if vertices passed exist in graph; if vertex v isn't in the graph, do nothing
             return
         if u not in self.adj_list:                                                                                          # if vertex u isn't in the graph, do nothing
             return
-        if u in self.adj_list[v]:                                                                                           # If here, both vertices exist -> check each vertex and remove edge from both
-            self.adj_list[v].remove(u)                                                                                      # if there is an edge to u in v, remove it
-        if v in self.adj_list[u]:                                                                                           # if there is an edge to v in u, remove it
-            self.adj_list[u].remove(v)
+        if u not in self.adj_list[v]:                                                                                       # If here, both vertices exist -> if there is no edge between them, do nothing
+            return
+        self._unlink(v, u)                                                                                                  # remove edge from both vertices
+        self._unlink(u, v)
+        self.edge_count -= 1
+        if self._components is not None:
+            self._components.edge_removed(u, v)
 
 
     def remove_vertex(self, v: str) -> None:
         """
-        Method takes a vertex and removes that vertex and all connected edges from the graph.
+        Method takes a vertex and removes that vertex and all connected edges from the graph. Since the graph is undirected,
+        the neighbors of v are exactly the vertices whose neighbors have to change, so only those are visited (O(degree) with
+        hash storage; list storage also pays for searching each neighbor's list)
         """
+        self._check_writable()
         if v not in self.adj_list:
             return
-        self.adj_list.pop(v)                                                                                                # Delete key 'v' and its associated value (list of neighbors/edges) from the graph
-        for key in self.adj_list:                                                                                           # Iterate through rest of dictionary -> if 'v' is found as a neighbor/edge to other vertices, delete it
-            if v in self.adj_list[key]:
-                self.adj_list[key].remove(v)
+        if self._components is not None:                                                                                    # when tracking components, remove the edges one by one so splits are detected
+            for neighbor in list(self.adj_list[v]):
+                self.remove_edge(v, neighbor)
+            self._components.vertex_removed(v)
+        self.edge_count -= len(self.adj_list[v])                                                                            # every remaining neighbor of v is an edge that goes away with it
+        for neighbor in self.adj_list[v]:                                                                                   # delete v from the neighbors of each of its neighbors
+            self._unlink(neighbor, v)
+        self._drop(v)                                                                                                       # Delete key 'v' and its associated value (list of neighbors/edges) from the graph
+
+
+    def remove_vertices(self, vertices) -> None:
+        """
+        Method takes an iterable of vertices and removes all of them (and all their edges) from the graph in one pass. Vertices
+        not in the graph are ignored. Edges between two removed vertices are simply dropped with them, and each surviving
+        neighbor is updated once: with list storage its list is rebuilt once instead of calling remove for every deleted neighbor
+        """
+        self._check_writable()
+        doomed = {v for v in vertices if v in self.adj_list}
+        if self._components is not None:                                                                                    # splits have to be detected edge by edge
+            for v in doomed:
+                self.remove_vertex(v)
+            return
+        affected = set()                                                                                                    # surviving vertices that lose at least one neighbor
+        internal = 0                                                                                                        # edges between two removed vertices (seen from both ends)
+        for v in doomed:
+            for neighbor in self.adj_list[v]:
+                if neighbor in doomed:
+                    internal += 1
+                    continue
+                self.edge_count -= 1
+                if self.storage == 'hash':
+                    self._unlink(neighbor, v)
+                else:
+                    affected.add(neighbor)
+        self.edge_count -= internal // 2
+        for neighbor in affected:
+            self._sorted_cache.pop(neighbor, None)
+            if self.storage == 'compact':
+                self.adj_list.keep_neighbors(neighbor, lambda name: name not in doomed)
+            else:
+                self.adj_list[neighbor] = [x for x in self.adj_list[neighbor] if x not in doomed]
+        for v in doomed:
+            self._drop(v)
+
+
+    def _drop(self, v: str) -> None:
+        """
+        Helper method that deletes vertex v (whose edges were already taken care of) from the adjacency store
+        """
+        self._check_writable()
+        self._sorted_cache.pop(v, None)
+        self._edge_index = None
+        if self.storage == 'compact':
+            self.adj_list.release(v)
+        else:
+            self.adj_list.pop(v)
+
+
+    def _link(self, u: str, v: str) -> None:
+        """
+        Helper method that adds v to the neighbors of u, using the container of the current storage mode
+        (list append, O(1) dict insertion that keeps insertion order, or id append)
+        """
+        self._check_writable()
+        self._sorted_cache.pop(u, None)                                                                                     # u's alphabetized neighbors are now out of date
+        self._edge_index = None
+        if self.storage == 'list':
+            self.adj_list[u].append(v)
+        elif self.storage == 'hash':
+            self.adj_list[u][v] = None
+        else:
+            self.adj_list.link(u, v)
+
+
+    def _unlink(self, u: str, v: str) -> None:
+        """
+        Helper method that removes v from the neighbors of u (v must be a neighbor). O(degree) for list and compact storage,
+        O(1) for hash
+        """
+        self._check_writable()
+        self._sorted_cache.pop(u, None)
+        self._edge_index = None
+        if self.storage == 'list':
+            self.adj_list[u].remove(v)
+        elif self.storage == 'hash':
+            del self.adj_list[u][v]
+        else:
+            self.adj_list.unlink(u, v)
+
+
+    def _check_writable(self) -> None:
+        """
+        Helper method that raises TypeError if the graph can't be changed (opened from a memory-mapped snapshot)
+        """
+        if self.storage == 'mapped':
+            raise TypeError('graph loaded from a memory-mapped snapshot is read-only')
+
+
+    def _sorted_neighbors(self, v: str) -> []:
+        """
+        Helper method that returns the neighbors of v in alphabetical order. The sorted list is cached per vertex and only
+        rebuilt after an edge of v was added or removed, so ordered traversals walk it directly instead of re-sorting on every visit.
+        The returned list must not be modified by the caller.
+        """
+        neighbors = self._sorted_cache.get(v)
+        if neighbors is None:
+            neighbors = sorted(self.adj_list[v])
+            self._sorted_cache[v] = neighbors
+        return neighbors
         
 
     def get_vertices(self) -> []:
@@ -111,15 +371,21 @@ class UndirectedGraph:
         """
         Method that returns a list of edges in the graph (any order) as a tuple of the two vertices making that edge
         """
-        e_list = []
-        for vertex in self.adj_list:                                                                                        # for each key in the graph dictionary
-            for neighbor in self.adj_list[vertex]:                                                                          # iterate through its edges
-                edge = (vertex, neighbor)                                                                                   # create edge tuple
-                reverse_edge = (neighbor, vertex)                                                                           # reverse_edge is the same edge with the strings backwards
-                if edge not in e_list and reverse_edge not in e_list:                                                       # if neither has been added to the edge list, add it
-                    e_list.append(edge)
-        return e_list
-        
+        return list(self.iter_edges())
+
+
+    def iter_edges(self):
+        """
+        Generator method that yields every edge of the graph exactly once, as a tuple of its two vertices, in O(V + E).
+        Instead of checking which edges were already listed, each edge is only yielded from the endpoint that comes first
+        in the graph's vertex order (the order vertices were added in)
+        """
+        rank = {vertex: index for index, vertex in enumerate(self.adj_list)}                                                # position of each vertex in the vertex order
+        for vertex in self.adj_list:
+            for neighbor in self.adj_list[vertex]:
+                if rank[vertex] < rank[neighbor]:                                                                           # the edge belongs to the endpoint that comes first
+                    yield (vertex, neighbor)
+
 
     def is_valid_path(self, path: []) -> bool:
         """
@@ -140,139 +406,138 @@ class UndirectedGraph:
         return True                                                                                                         # if this reached, there is an edge between all vertices in the given path -> is valid returns True
 
 
+    def validate_paths(self, paths):
+        """
+        Method that checks many paths at once and returns one boolean per path, the same answer as is_valid_path. paths can
+        be a list of lists of vertex names, a 2-D string array with one path per row, or a 1-D object array of ragged rows.
+        Vertex names are looked up once in an integer id table, and each step of a path is a single lookup of an integer
+        edge key in a hashed set of all edges (see _edge_keys), so there is no per-path rescan of the vertices.
+        Returns a NumPy bool array, or a list of bools without NumPy
+        """
+        if np is not None and isinstance(paths, np.ndarray):                                                                # rows (and NumPy strings) -> plain lists of str
+            paths = paths.tolist()
+        ids, n, edge_keys = self._edge_keys()
+        get_id = ids.get
+        result = []
+        for path in paths:
+            if np is not None and isinstance(path, np.ndarray):
+                path = path.tolist()
+            valid = True
+            prev = get_id(path[0]) if len(path) else 0
+            if prev is None:                                                                                                # vertex not in the graph
+                valid = False
+            else:
+                for vertex in path[1:]:
+                    current = get_id(vertex)
+                    if current is None or prev * n + current not in edge_keys:                                              # unknown vertex or no edge from the previous one
+                        valid = False
+                        break
+                    prev = current
+            result.append(valid)
+        if np is not None:
+            return np.array(result, dtype=bool)
+        return result
+
+
+    def _edge_keys(self):
+        """
+        Helper method that returns (ids, n, edge_keys): ids maps every vertex name to an integer id below n, and edge_keys
+        holds u * n + v for both directions of every edge. Built in O(V + E) (compact storage reuses its interned ids) and
+        cached until the graph changes
+        """
+        if self._edge_index is None:
+            if self.storage in ('compact', 'mapped'):
+                ids, n, row = self.adj_list.ids, len(self.adj_list.names), self.adj_list.row
+                edge_keys = {u * n + v for u in ids.values() for v in row(u)}
+            else:
+                ids = {vertex: i for i, vertex in enumerate(self.adj_list)}
+                n = len(ids)
+                edge_keys = {ids[vertex] * n + ids[neighbor] for vertex in self.adj_list for neighbor in self.adj_list[vertex]}
+            self._edge_index = (ids, n, edge_keys)
+        return self._edge_index
+
+
     def dfs(self, v_start, v_end=None) -> []:
         """
-        Method that takes a starting vertex and an ending vertex and performs a depth-first search of the graph via a recursive
-        helper method that adds vertices to be visited to the deque, and visited vertices to the list to be returned.
+        Method that takes a starting vertex and an ending vertex and returns the list of vertices visited during a depth-first
+        search of the graph (collected from the iter_dfs generator).
         Vertices to traverse are picked in alphabetical order. If the starting vertex is not in the graph, an empty list is returned.
         If the ending vertex is not in the graph, the search continues as if there was no end vertex (until all vertices are visited).
         """
-        v_visited = []
-        if v_start not in self.adj_list:
-            return v_visited
-        self.rec_dfs(v_start, v_end, v_visited)
-        return v_visited
+        return list(self.iter_dfs(v_start, v_end))
 
 
-    def rec_dfs(self, vertex=None, end_vertex=None, list_v=None):
+    def iter_dfs(self, v_start, v_end=None):
         """
-        Recursive helper method that takes as parameters the vertex to be added to the list of visited vertices, the provided end vertex, and the list of visited vertices.
-        A new deque is created and alphabetized for each set of neighbors (to keep separate from previous/future vertices' neighbor).
-        Neighbors are added to the deque only if they have not been previously visited (in visit list).
-        Each neighbor in the created deque is popped into a variable and recursively passed back to the function and the process is repeated until all deques are
-            empty/visitable vertices are all added to the list, or until the end vertex is hit.
+        Generator method that performs an iterative depth-first search and yields each vertex as it is visited, so callers can
+        stop early without building the full list. Uses an explicit stack of neighbor iterators (one per vertex on the current
+        path) instead of recursion, so long paths can't hit the recursion limit, and a visited set for O(1) membership checks.
+        Neighbors are visited in alphabetical order. Nothing is yielded if the starting vertex is not in the graph, and the
+        search stops right after the ending vertex is yielded.
         """
-        # Append the new vertex to list of vertices visited
-        if vertex not in list_v:
-            list_v.append(vertex)
-
-        # Return conditions without visiting additional vertices
-        if vertex == end_vertex:
-            return list_v
-
-        # Add neighbors of current vertex to a new deque to visit (in alphabetical order)
-        v_deque = deque([])
-        for neighbor in self.adj_list[vertex]:                                                                              # for a vertex's neighbors
-            if neighbor not in list_v:                                                                                      # if the neighbor hasn't already been visited (in visited list)
-                if not v_deque:                                                                                             # if deque is empty, append first neighbor found
-                    v_deque.append(neighbor)
-                else:                                                                                                       # if a neighbor already in the deque
-                    i = 0
-                    deque_len = len(v_deque)
-                    while i < deque_len:                                                                                    # Alphabetizing-while loop
-                        if neighbor < v_deque[i] and neighbor not in v_deque:                                               # go through deque to alphabetize neighbors (i.e. if current neighbor is less than/earlier than neighbor in deque, insert it before the deque-neighbor
-                            v_deque.insert(i, neighbor)
-                        i += 1
-                    if neighbor not in v_deque:                                                                             # if it reaches here, it's later/larger than all other neighbors in deque, so append it to the end
-                        v_deque.append(neighbor)
-
-        # Recursion to set next visited vertex as first neighbor in deque
-        while v_deque:                                                                                                      # while current deque of neighbors is not empty,
-            if end_vertex in list_v:
-                return list_v
-            current = v_deque.popleft()                                                                                     # pop out first(leftmost) neighbor to be visited next
-            self.rec_dfs(current, end_vertex, list_v )
-
-        return list_v
-
+        if v_start not in self.adj_list:
+            return
+        visited = {v_start}
+        yield v_start
+        if v_start == v_end:
+            return
+        stack = [iter(self._sorted_neighbors(v_start))]                                                                     # stack holds, for each vertex on the current path, an iterator over its remaining neighbors
+        while stack:
+            for neighbor in stack[-1]:                                                                                      # continue with the next neighbor of the deepest vertex
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield neighbor
+                    if neighbor == v_end:
+                        return
+                    stack.append(iter(self._sorted_neighbors(neighbor)))                                                    # go one level deeper before looking at the remaining neighbors
+                    break
+            else:                                                                                                           # all neighbors of the deepest vertex are visited -> backtrack
+                stack.pop()
 
 
     def bfs(self, v_start=None, v_end=None) -> []:
         """
-        Method that takes a start vertex and and end vertex and returns a list of vertices visited during BFS search. Vertices
-        are added to the list during the search until either the end vertex is reached, or all vertices have been visited (end
-        vertex does not exist within the graph)
+        Method that takes a start vertex and and end vertex and returns a list of vertices visited during BFS search (collected
+        from the iter_bfs generator). Vertices are added to the list during the search until either the end vertex is reached,
+        or all vertices have been visited (end vertex does not exist within the graph)
         Vertices are picked in alphabetical order.
         """
-        v_visited = []
-        if v_start not in self.adj_list:
-            return v_visited
-        v_deque = deque([v_start])                                                                                          # deque to hold current level vertices, initialized with start vertex
-        v_visited.append(v_start)                                                                                           # add start vertex to visited list
-        self.rec_bfs(v_end, v_visited,v_deque)
-        return v_visited
-
-
-
-    def rec_bfs(self, end_vertex=None, list_v=None, cur_deque=None):
-        """
-        Recursive helper method for Breadth-First Search that examines current-level vertices from the current deque passed
-        to it and adds direct successor vertices from each vertex examined in a BFS manner
-        :param end_vertex: The vertex that signals the end of the BFS search. If none is provided, or if it doesn't exist
-                in the graph, the BFS continues until all vertices have been visited
-        :param list_v: the list of visited vertices
-        :param cur_deque: the deque of vertices to be processed for their direct successors
-        :return: list of visited vertices
-        """
-        # Check if end vertex is already in list
-        if end_vertex in list_v:
-            return list_v
-
-        # While the v_deque is not empty, pop from the front of the deque -> add successors to s_deque alphabetically -> add successors in s_deque to visited list -> normal append vertices in s_deque to next_deque
-        s_deque = deque([])                                                                                                 # deque to add successors of current vertex (and added to visited list)
-        next_deque = deque([])                                                                                              # deque with successors that is passed back to method
-        while cur_deque:                                                                                                    # goes through all current level vertices
-            current = cur_deque.popleft()
-
-            # Add current level vertex's direct successors to s_deque if they've not been visited
-            for neighbor in self.adj_list[current]:
-                if neighbor not in list_v and neighbor not in cur_deque:
-                    if not s_deque:
-                        s_deque.append(neighbor)
-                    else:
-                        i=0
-                        deque_len = len(s_deque)
-                        while i < deque_len:                                                                                # alphabetizing loop that adds successor vertices into s_deque
-                            if neighbor < s_deque[i] and neighbor not in s_deque:
-                                s_deque.insert(i, neighbor)
-                            i +=1
-                        if neighbor not in s_deque:                                                                         # if it reaches here, vertex is later/larger than all other neighbors in deque, so append it to the end
-                            s_deque.append(neighbor)
-
-            # For each element in s_deque (current level vertex's direct successors), if not visited yet, add to visited list
-            for vertex in s_deque:
-                if vertex not in list_v:
-                    list_v.append(vertex)
-                if vertex == end_vertex:  # if end vertex found, return visited list
-                    return list_v
-
-            # Append normally current vertex's direct successors to next_deque(eventually passed back recursively
-            for vertex in s_deque:
-                next_deque.append(vertex)
-
-        # if deque for successors has vertices, pass it back to method recursively
-        if next_deque:
-            self.rec_bfs(end_vertex, list_v, next_deque)
-        return list_v                                                                                                       # if reached here, while loop for current deque has finished and successor deque is empty.
+        return list(self.iter_bfs(v_start, v_end))
 
 
+    def iter_bfs(self, v_start=None, v_end=None):
+        """
+        Generator method that performs an iterative breadth-first search using a deque as queue and a visited set, and yields
+        each vertex when it is first discovered. The direct successors of each vertex are discovered in alphabetical order.
+        Nothing is yielded if the starting vertex is not in the graph, and the search stops right after the ending vertex is yielded.
+        """
+        if v_start not in self.adj_list:
+            return
+        visited = {v_start}
+        yield v_start
+        if v_start == v_end:
+            return
+        v_deque = deque([v_start])                                                                                          # queue of discovered vertices whose successors still have to be examined
+        while v_deque:
+            current = v_deque.popleft()
+            for neighbor in self._sorted_neighbors(current):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield neighbor
+                    if neighbor == v_end:
+                        return
+                    v_deque.append(neighbor)
+
 
     def count_connected_components(self) -> int:
         """
-        Method that returns the number of connected components in the graph
+        Method that returns the number of connected components in the graph. If component tracking is enabled, the maintained
+        count is returned in O(1), otherwise a DFS is run from every vertex not visited yet
         """
+        if self._components is not None:
+            return len(self._components.members)
         unvisited = deque([])                                                                                               # unvisited deque to put all vertices in the graph
-        total_v = []                                                                                                        # list to hold all visited vertices up to current point
+        total_v = set()                                                                                                     # set to hold all visited vertices up to current point
         component = 0                                                                                                       # variable to hold count of components
 
         # Add all graph's vertices to deque
@@ -285,52 +550,582 @@ class UndirectedGraph:
             if current not in total_v:                                                                                      # if it hasn't been visited yet, do a dfs on it
                 visited = self.dfs(current)
                 component +=1
-            for vertex in visited:                                                                                          # add all vertices visited from single dfs search to total visited list
-                total_v.append(vertex)
+                total_v.update(visited)                                                                                     # add all vertices visited from single dfs search to total visited set (once per component)
         return component                                                                                                    # loop ends when all vertices have been visited
 
 
-    def has_cycle(self)-> bool:
+    def connected_components(self, workers=None):
+        """
+        Method that finds the connected components with union-find and returns a tuple (count, labels), where labels maps
+        every vertex to the number of its component (components are numbered 0, 1, ... in the order their first vertex
+        appears in the graph). The adjacency is copied once in CSR layout over integer ids (see _id_csr) into a shared memory
+        block, cut into one shard of about equal edge count per worker process, and every worker runs union-find on its
+        shard and returns only the edges that joined two trees (its partial spanning forest). The forests are then merged
+        with one more union-find pass in this process. workers defaults to the number of CPUs; with workers=1 everything
+        runs in this process
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        ids, offsets, targets = self._id_csr()
+        v_count = len(offsets) - 1
+        if workers <= 1 or len(targets) < 2:
+            forests = [_union_find_forest(offsets, targets, 0, v_count, v_count)]
+        else:
+            shards = []
+            start = 0
+            for shard in range(1, workers + 1):                                                                             # vertex ranges holding about len(targets) / workers edge entries each
+                end = v_count if shard == workers else bisect_left(offsets, len(targets) * shard // workers, start)
+                shards.append((start, end))
+                start = end
+            with shared_arrays([offsets, targets]) as layout:                                                               # offsets and targets copied once into shared memory
+                with Pool(workers, initializer=attach_shared_arrays, initargs=(layout,)) as pool:
+                    forests = pool.map(_shared_forest, shards, 1)
+        parent = array('q', range(v_count))
+        for forest in forests:                                                                                              # merge: union the forest edges of every shard
+            for i in range(0, len(forest), 2):
+                _union(parent, forest[i], forest[i + 1])
+        labels = dict()
+        numbers = dict()                                                                                                    # root id -> component number
+        for vertex, i in ids.items():
+            root = _find(parent, i)
+            if root not in numbers:
+                numbers[root] = len(numbers)
+            labels[vertex] = numbers[root]
+        return len(numbers), labels
+
+
+    def _id_csr(self):
+        """
+        Helper method that returns (ids, offsets, targets): ids maps every vertex name to an integer id (in vertex order), and
+        the neighbor ids of vertex i are targets[offsets[i]:offsets[i+1]]. Compact and mapped storage reuse their interned
+        ids and copy their CSR arrays as they are, after writing back any pending rows (unused ids of compact storage have
+        empty rows)
+        """
+        if self.storage in ('compact', 'mapped'):
+            self.adj_list.compact()
+            return self.adj_list.ids, array('q', self.adj_list.offsets.tobytes()), array('i', self.adj_list.targets.tobytes())
+        offsets = array('q', [0])
+        ids = {vertex: i for i, vertex in enumerate(self.adj_list)}
+        targets = array('q')
+        for vertex in self.adj_list:
+            targets.extend(ids[neighbor] for neighbor in self.adj_list[vertex])
+            offsets.append(len(targets))
+        return ids, offsets, targets
+
+
+    def enable_component_tracking(self) -> None:
         """
-        Method that returns True if the graph contains at least one cycle, and False otherwise. It uses a recursive helper method
-        to do a regular (non-alphabetical) DFS traversal on the graph to check for cycles. This code was written using references
-        to the DFS/BFS algorithm in the exploration Working with Graphs and the algorithm from
-        https://www.interviewbit.com/tutorial/depth-first-search/ for generic DFS, except it uses boolean values instead of an
-        empty set to mark a vertex as visited or not (True or False)
+        Method that turns on incremental connected-component tracking (does nothing if it is already on). The components are
+        labelled once in O(V + E), after which add_edge/remove_edge/add_vertex/remove_vertex keep them up to date and
+        count_connected_components, component_of, same_component and has_cycle answer without traversing the graph
         """
-        for vertex in self.adj_list:                                                                                        # checks all vertices
+        if self._components is None:
+            self._components = ComponentIndex(self)
 
-            # Initialize visited dictionary -> each key is vertex, initialized to False (unvisited)
-            visited = {vertex: False for vertex in self.adj_list}                                                           # Must be initialized within for loop for each component looked at. Otherwise would retain 'True' value from previous components
-            parent = None                                                                                                   # initialize parent variable to None within for loop
-            if self.dfs_cycle(vertex, parent, visited) == True:                                                             # if the dfs traversal returns True, cycle is found, so return True
-                return True
+
+    def component_of(self, v: str):
+        """
+        Method that takes a vertex and returns the id (integer) of the connected component containing it, or None if the vertex
+        is not in the graph. Two vertices are in the same component exactly when their ids are equal; ids of untouched components
+        stay the same across edits. Needs component tracking (raises ValueError if it is off, see enable_component_tracking)
+        """
+        if self._components is None:
+            raise ValueError('component tracking is not enabled')
+        return self._components.label.get(v)
+
+
+    def same_component(self, u: str, v: str) -> bool:
+        """
+        Method that takes two vertices and returns True if there is a path between them (they are in the same connected
+        component), and False otherwise or if either vertex is not in the graph. Compares the maintained component ids if
+        component tracking is enabled, otherwise runs a breadth-first search from u that stops as soon as v is found
+        """
+        if u not in self.adj_list or v not in self.adj_list:
+            return False
+        if self._components is None:
+            return v in self.iter_bfs(u, v)
+        return self.component_of(u) == self.component_of(v)
+
+
+    def has_cycle(self)-> bool:
+        """
+        Method that returns True if the graph contains at least one cycle, and False otherwise.
+        If component tracking is enabled, the answer comes in O(1) from the forest property: a graph without cycles has exactly
+        V - C edges (V vertices, C connected components), and any extra edge closes a cycle.
+        Otherwise an iterative breadth-first search is run over every component in O(V + E), remembering the parent each vertex
+        was discovered from: reaching an already-visited vertex that isn't the current vertex's parent means a cycle was found
+        """
+        if self._components is not None:
+            return self.edge_count > len(self.adj_list) - len(self._components.members)
+        parent = dict()                                                                                                     # visited vertices -> vertex they were discovered from (None for the first vertex of a component)
+        for vertex in self.adj_list:                                                                                        # checks all components (one visited set shared by all of them)
+            if vertex in parent:
+                continue
+            parent[vertex] = None
+            v_deque = deque([vertex])
+            while v_deque:
+                current = v_deque.popleft()
+                for neighbor in self.adj_list[current]:
+                    if neighbor not in parent:                                                                              # unvisited -> discovered from current
+                        parent[neighbor] = current
+                        v_deque.append(neighbor)
+                    elif neighbor != parent[current]:                                                                       # visited, and not the edge back to where current came from -> cycle found
+                        return True
         return False                                                                                                        # all vertices have been checked without returning True, so no cycle exists (False)
 
 
-    def dfs_cycle(self, cur_v=None, parent_v = None, list_v = None):
+    def shortest_hop_path(self, u: str, v: str) -> []:
         """
-        Recursive helper method that does a regular dfs search on the list while keeping track of the current parent node. Extra condition
-        involving neighbor-parent vertices comparison used to detect cycle in graph
-        :param cur_v: current vertex being visited (starts at vertex passed by calling method)
-        :param parent_v: initially None, becomes current vertex on subsequent recursive call when passing back a neighbor/adjacent vertex
-        :param list_v: dictionary of vertices whose values equal True if they've been visited and False if unvisited
-        :return: True if a cycle is found (if a neighboring vertex is already visited but the neighbor of the current vertex isn't its parent
+        Method that returns a shortest path (fewest edges) from u to v as a list of vertices, found with a bidirectional
+        breadth-first search (see _bidirectional_bfs). Returns an empty list if u or v is not in the graph or if v can't be
+        reached from u
         """
-        list_v[cur_v] = True                                                                                                # mark the current vertex as having been visited (True)
-        for neighbor in self.adj_list[cur_v]:                                                                               # for the neighbors of this current vertex
-            if list_v[neighbor] == False:                                                                                   # if the neighbor is unvisited, visit the neighbor recursively (dfs traversal),
-                cycle = self.dfs_cycle(neighbor, cur_v, list_v)                                                             # using neighbor as new current vertex, current vertex as parent, and the visited dict
-                if cycle == True:
-                    return True
-            else:
-                if neighbor != parent_v:                                                                                    # if the neighbor has been visited, and the neighbor is not the parent of the current vertex, cycle found
-                    return True
+        return self._bidirectional_bfs(u, v)[1]
+
+
+    def hop_distance(self, u: str, v: str):
+        """
+        Method that returns the number of edges on a shortest path from u to v (0 if u and v are the same vertex), or inf
+        if u or v is not in the graph or if v can't be reached from u
+        """
+        return self._bidirectional_bfs(u, v)[0]
+
+
+    def _bidirectional_bfs(self, u: str, v: str):
+        """
+        Helper method that runs one BFS from u and one from v, one whole level at a time, always expanding the side whose
+        frontier has fewer vertices, and stops when the two searches meet. Meeting vertices found while expanding a level can
+        still differ in distance, so the level is finished and the shortest connection is kept. Returns (hops, path), or
+        (inf, []) if the frontiers never meet. On graphs where the number of vertices grows quickly with the distance, the
+        two half-depth searches visit far fewer vertices than one full-depth search
+        """
+        if u not in self.adj_list or v not in self.adj_list:
+            return float('inf'), []
+        if u == v:
+            return 0, [u]
+        parents = ({u: None}, {v: None})                                                                                    # index 0 = search from u, 1 = search from v
+        dists = ({u: 0}, {v: 0})
+        frontiers = [[u], [v]]
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, dist, other = parents[side], dists[side], dists[1 - side]
+            best, meet = float('inf'), None
+            reached = []
+            for current in frontiers[side]:
+                for neighbor in self.adj_list[current]:
+                    if neighbor in other and dist[current] + 1 + other[neighbor] < best:                                    # edge between the two searches -> candidate path
+                        best = dist[current] + 1 + other[neighbor]
+                        meet = (current, neighbor) if side == 0 else (neighbor, current)
+                    if neighbor not in parent:
+                        parent[neighbor] = current
+                        dist[neighbor] = dist[current] + 1
+                        reached.append(neighbor)
+            if meet is not None:
+                path = []
+                vertex = meet[0]
+                while vertex is not None:                                                                                   # first half: back from the meeting edge to u
+                    path.append(vertex)
+                    vertex = parents[0][vertex]
+                path.reverse()
+                vertex = meet[1]
+                while vertex is not None:                                                                                   # second half: on to v
+                    path.append(vertex)
+                    vertex = parents[1][vertex]
+                return best, path
+            frontiers[side] = reached
+        return float('inf'), []
+
+
+def _find(parent, x: int) -> int:
+    """
+    Function that returns the root of x in a union-find parent array, halving the path on the way
+    """
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def _union(parent, u: int, v: int) -> bool:
+    """
+    Function that joins the trees of u and v in a union-find parent array (the larger root id is hung below the smaller
+    one). Returns True if they were in different trees
+    """
+    u, v = _find(parent, u), _find(parent, v)
+    if u == v:
         return False
+    if u < v:
+        parent[v] = u
+    else:
+        parent[u] = v
+    return True
+
+
+def _union_find_forest(offsets, targets, first: int, end: int, v_count: int):
+    """
+    Function that runs union-find over the edges of vertices first to end-1 of a CSR adjacency and returns the partial
+    spanning forest found: the edges that joined two different trees, flattened into an array('q') as u0, v0, u1, v1, ...
+    Every undirected edge is listed from both ends, so it is only used from its smaller id
+    """
+    parent = array('q', range(v_count))
+    forest = array('q')
+    for u in range(first, end):
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if v > u and _union(parent, u, v):
+                forest.append(u)
+                forest.append(v)
+    return forest
+
+
+def _shared_forest(bounds):
+    """
+    Function run by the connected_components workers for one shard (first, end) of vertices: returns its partial forest,
+    computed on the shared CSR arrays (see graph_io.shared_arrays)
+    """
+    offsets, targets = worker_arrays()
+    return _union_find_forest(offsets, targets, bounds[0], bounds[1], len(offsets) - 1)
+
+
+class CompactAdjacency(Mapping):
+    """
+    Class used as adj_list by UndirectedGraph(storage='compact') and by the read-only 'mapped' mode
+    - every vertex name is interned once: ids maps name -> integer id, names maps id -> name (ids of removed vertices are
+      reused by later vertices)
+    - the neighbor ids of all vertices are kept in compressed sparse row (CSR) layout: the neighbors of vertex id i are
+      targets[offsets[i]:offsets[i+1]], with targets one flat array('i') and offsets one array('q'). An adjacency entry
+      takes 4 bytes and a vertex 8 bytes of offsets, with no container object per vertex
+    - the flat arrays can't be edited in place: the first edit of a vertex copies its row into the pending dict
+      (id -> array('i')), where its later edits go. Once the number of edits since the last compaction passes a quarter of
+      the size of targets, the pending rows are written back by compact(), so the copying costs O(1) amortized per edit
+    - reading works like the dict of lists of the other storage modes: adj_list[name] gives a CompactNeighbors view that
+      iterates the neighbor names, and vertices iterate in the order they were added. Changes go through the UndirectedGraph methods
+    """
+
+    def __init__(self):
+        """
+        Create an empty adjacency store
+        """
+        self.ids = dict()
+        self.names = []
+        self.offsets = array('q', [0])
+        self.targets = array('i')
+        self.pending = dict()                                                                                               # id -> neighbor ids of the vertices edited since the last compact()
+        self.edits = 0                                                                                                      # number of edits since the last compact()
+        self.free_ids = []                                                                                                  # ids of removed vertices, reused first
+
+
+    def __getitem__(self, name: str):
+        """
+        Return a view of the neighbors of the vertex with the given name
+        """
+        return CompactNeighbors(self, self.ids[name])
+
+
+    def __iter__(self):
+        """
+        Iterate over the vertex names in the order they were added
+        """
+        return iter(self.ids)
+
+
+    def __len__(self):
+        """
+        Return the number of vertices
+        """
+        return len(self.ids)
+
+
+    def __contains__(self, name):
+        """
+        Return True if there is a vertex with the given name (O(1), no view is created)
+        """
+        return name in self.ids
+
+
+    def row(self, i: int):
+        """
+        Method that returns the neighbor ids of vertex id i: its pending row if it was edited since the last compaction,
+        otherwise its slice of targets
+        """
+        row = self.pending.get(i)
+        if row is None:
+            return self.targets[self.offsets[i]:self.offsets[i + 1]]
+        return row
+
+
+    def degree(self, i: int) -> int:
+        """
+        Method that returns the number of neighbors of vertex id i without copying its row
+        """
+        row = self.pending.get(i)
+        if row is None:
+            return self.offsets[i + 1] - self.offsets[i]
+        return len(row)
+
+
+    def _edit(self, i: int):
+        """
+        Helper method that counts one edit of vertex id i and returns its pending row, copying the row out of the flat arrays
+        on its first edit (after compacting first if there were enough edits to pay for it)
+        """
+        self.edits += 1
+        row = self.pending.get(i)
+        if row is None:
+            if self.edits > len(self.targets) // 4 + 64:
+                self.compact()
+            row = self.pending[i] = self.targets[self.offsets[i]:self.offsets[i + 1]]
+        return row
 
 
+    def compact(self) -> None:
+        """
+        Method that writes the pending rows back into new flat offsets and targets arrays, in O(V + E). The rows between two
+        pending ones are copied with one slice and their offsets shifted by the same amount
+        """
+        if not self.pending:
+            return
+        old_offsets, old_targets = self.offsets, self.targets
+        offsets = array('q', [0])
+        targets = array('i')
+        start = 0                                                                                                           # first vertex id of the current run of unedited rows
+        for i in sorted(self.pending) + [len(self.names)]:
+            shift = len(targets) - old_offsets[start]
+            targets.extend(old_targets[old_offsets[start]:old_offsets[i]])
+            offsets.extend([offset + shift for offset in old_offsets[start + 1:i + 1]])
+            if i < len(self.names):
+                targets.extend(self.pending[i])
+                offsets.append(len(targets))
+                start = i + 1
+        self.offsets, self.targets = offsets, targets
+        self.pending = dict()
+        self.edits = 0
+
+
+    def intern(self, name: str) -> int:
+        """
+        Method that adds a vertex without neighbors and returns its id
+        """
+        if self.free_ids:
+            i = self.free_ids.pop()
+            self.names[i] = name
+        else:
+            i = len(self.names)
+            self.names.append(name)
+            self.offsets.append(self.offsets[-1])                                                                           # empty row at the end of targets
+        self.ids[name] = i
+        return i
+
+
+    def release(self, name: str) -> None:
+        """
+        Method that deletes a vertex and frees its id for reuse (its neighbors must already be unlinked from it)
+        """
+        i = self.ids.pop(name)
+        self.names[i] = None
+        if self.degree(i):                                                                                                  # the id's row must be empty when it is reused
+            del self._edit(i)[:]
+        self.free_ids.append(i)
+
+
+    def link(self, u: str, v: str) -> None:
+        """
+        Method that appends v's id to u's neighbor ids
+        """
+        self._edit(self.ids[u]).append(self.ids[v])
 
-   
+
+    def link_ids(self, firsts, seconds) -> None:
+        """
+        Method that adds the edge firsts[k] - seconds[k] (in both directions) for every k, given two arrays of vertex ids.
+        Used to build a graph in bulk: the flat arrays are rebuilt once with a counting sort instead of editing a row per
+        edge, and every row gets its new neighbors in edge order, like calling link for each edge
+        """
+        self.compact()
+        counts = [self.offsets[i + 1] - self.offsets[i] for i in range(len(self.names))]
+        for i in chain(firsts, seconds):
+            counts[i] += 1
+        offsets = array('q', [0])
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+        targets = array('i', bytes(4 * offsets[-1]))
+        fill = array('q', offsets)                                                                                          # next free position in each new row
+        for i in range(len(self.names)):                                                                                    # old neighbors first
+            old = self.targets[self.offsets[i]:self.offsets[i + 1]]
+            targets[fill[i]:fill[i] + len(old)] = old
+            fill[i] += len(old)
+        for i, j in zip(firsts, seconds):
+            targets[fill[i]] = j
+            fill[i] += 1
+            targets[fill[j]] = i
+            fill[j] += 1
+        self.offsets, self.targets = offsets, targets
+
+
+    def unlink(self, u: str, v: str) -> None:
+        """
+        Method that deletes v's id from u's neighbor ids
+        """
+        row = self._edit(self.ids[u])
+        del row[row.index(self.ids[v])]
+
+
+    def keep_neighbors(self, name: str, keep) -> None:
+        """
+        Method that rebuilds a vertex's neighbor ids, keeping only the neighbors whose name passes the keep function
+        """
+        row = self._edit(self.ids[name])
+        row[:] = array('i', [j for j in row if keep(self.names[j])])
+
+
+class CompactNeighbors:
+    """
+    Class for the read-only view of one vertex's neighbors in a CompactAdjacency: iterates neighbor names in insertion
+    order, and supports len, 'in' and printing like a list of names
+    """
+
+    __slots__ = ('adjacency', 'i')
+
+    def __init__(self, adjacency, i: int):
+        """
+        Create a view of the neighbors of vertex id i
+        """
+        self.adjacency = adjacency
+        self.i = i
+
+
+    def __iter__(self):
+        """
+        Iterate over the neighbor names
+        """
+        names = self.adjacency.names
+        return (names[j] for j in self.adjacency.row(self.i))
+
+
+    def __len__(self):
+        """
+        Return the number of neighbors
+        """
+        return self.adjacency.degree(self.i)
+
+
+    def __contains__(self, name):
+        """
+        Return True if the vertex with the given name is a neighbor. The edge is stored in both rows, so the shorter
+        one is scanned
+        """
+        adjacency = self.adjacency
+        j = adjacency.ids.get(name)
+        if j is None:
+            return False
+        if adjacency.degree(self.i) <= adjacency.degree(j):
+            return j in adjacency.row(self.i)
+        return self.i in adjacency.row(j)
+
+
+    def __repr__(self):
+        """
+        Return the neighbor names formatted like a list
+        """
+        return repr(list(self))
+
+
+class ComponentIndex:
+    """
+    Class that keeps the connected components of an UndirectedGraph up to date under a stream of edits
+    - label maps each vertex to the integer id of its component, members maps each id to the set of its vertices
+    - adding an edge merges the two components by relabelling the smaller one (union by size), so every vertex is
+      relabelled O(log V) times over any sequence of insertions
+    - removing an edge runs two breadth-first searches from its endpoints, one vertex at a time each, until they meet
+      (still connected) or one of them runs out (split); the side that ran out becomes a new component, so the work of a
+      split is bounded by the size of the smaller side
+    """
+
+    def __init__(self, graph):
+        """
+        Label every component of the given graph once
+        """
+        self.graph = graph
+        self.label = dict()
+        self.members = dict()
+        self.next_id = 0
+        for vertex in graph.adj_list:
+            if vertex not in self.label:
+                self._new_component(set(graph.iter_bfs(vertex)))
+
+
+    def _new_component(self, vertices: set) -> int:
+        """
+        Helper method that gives a set of vertices a fresh component id and returns the id
+        """
+        c_id = self.next_id
+        self.next_id += 1
+        self.members[c_id] = vertices
+        for vertex in vertices:
+            self.label[vertex] = c_id
+        return c_id
+
+
+    def vertex_added(self, v: str) -> None:
+        """
+        Method called after a new vertex (without edges) is added to the graph -> it is a component of its own
+        """
+        self._new_component({v})
+
+
+    def vertex_removed(self, v: str) -> None:
+        """
+        Method called when a vertex whose edges were all removed is deleted from the graph
+        """
+        c_id = self.label.pop(v)
+        del self.members[c_id]                                                                                              # vertex without edges was the only member of its component
+
+
+    def edge_added(self, u: str, v: str) -> None:
+        """
+        Method called after the edge u-v is added to the graph. Merges the components of u and v if they differ
+        """
+        u_id, v_id = self.label[u], self.label[v]
+        if u_id == v_id:
+            return
+        if len(self.members[u_id]) < len(self.members[v_id]):                                                               # keep the id of the larger component, relabel the smaller one
+            u_id, v_id = v_id, u_id
+        moved = self.members.pop(v_id)
+        for vertex in moved:
+            self.label[vertex] = u_id
+        self.members[u_id] |= moved
+
+
+    def edge_removed(self, u: str, v: str) -> None:
+        """
+        Method called after the edge u-v is removed from the graph. If u and v are no longer connected, the side that was
+        explored completely is split off into a new component
+        """
+        side = self._split_side(u, v)
+        if side is not None:
+            self.members[self.label[u]] -= side
+            self._new_component(side)
+
+
+    def _split_side(self, u: str, v: str):
+        """
+        Helper method that runs breadth-first searches from u and from v in lockstep (one vertex from each per step). Returns
+        None as soon as the searches meet, or the set of vertices of the first search that finishes without meeting the other
+        """
+        adj_list = self.graph.adj_list
+        seen = ({u}, {v})
+        queues = (deque([u]), deque([v]))
+        while True:
+            for side in (0, 1):
+                if not queues[side]:                                                                                        # this search ran out -> its vertices form a whole component
+                    return seen[side]
+                current = queues[side].popleft()
+                for neighbor in adj_list[current]:
+                    if neighbor in seen[1 - side]:                                                                          # reached a vertex of the other search -> still connected
+                        return None
+                    if neighbor not in seen[side]:
+                        seen[side].add(neighbor)
+                        queues[side].append(neighbor)
 
 
 if __name__ == '__main__':
@@ -437,3 +1232,30 @@ if __name__ == '__main__':
         u, v = edge
         g.add_edge(u, v) if command == 'add' else g.remove_edge(u, v)
         print('{:<10}'.format(case), g.has_cycle())
+
+
+    print("\nshortest_hop_path() / hop_distance() example 1")
+    print("----------------------------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+    g = UndirectedGraph(edges)
+    for u, v in ['AH', 'HA', 'QF', 'AQ', 'DD']:
+        print(f'{u} -> {v}', g.hop_distance(u, v), g.shortest_hop_path(u, v))
+
+
+    print("\nconnected_components() example 1")
+    print("--------------------------------")
+    edges = ['AE', 'AC', 'BE', 'CE', 'CD', 'CB', 'BD', 'ED', 'BH', 'QG', 'FG']
+    g = UndirectedGraph(edges)
+    test_cases = (
+        'add QH', 'remove FG', 'remove GQ', 'remove HQ',
+        'remove AE', 'remove CA', 'remove EB', 'remove CE', 'remove DE',
+        'remove BC', 'add EA', 'add EF', 'add GQ', 'add AC', 'add DQ',
+        'add EG', 'add QH', 'remove CD', 'remove BD', 'remove QG')
+    for case in test_cases:
+        command, edge = case.split()
+        u, v = edge
+        g.add_edge(u, v) if command == 'add' else g.remove_edge(u, v)
+        count, labels = g.connected_components(workers=2)
+        print(count, count == g.count_connected_components(), end=' ')
+    print()
+    print(labels)